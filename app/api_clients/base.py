@@ -8,13 +8,55 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2 lets requests to the same host multiplex over one TLS connection
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool limits for the transport shared by all API clients
+SHARED_POOL_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=30.0)
+# Connection attempts retried on connect errors/timeouts - safe for any request,
+# since nothing has been sent yet
+SHARED_CONNECT_RETRIES = 2
+
+_shared_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+def get_shared_transport() -> httpx.AsyncHTTPTransport:
+    """Return the process-wide pooled transport, creating it on first use
+    
+    Every API client sends requests through this transport so keep-alive
+    connections are reused across sources that hit the same host (e.g. ERIC's
+    Europe PMC citation lookups share connections with the Europe PMC client).
+    """
+    global _shared_transport
+    if _shared_transport is None:
+        _shared_transport = httpx.AsyncHTTPTransport(
+            limits=SHARED_POOL_LIMITS,
+            http2=HTTP2_AVAILABLE,
+            retries=SHARED_CONNECT_RETRIES
+        )
+    return _shared_transport
+
+async def close_shared_transport():
+    """Close the shared connection pool - call once on application shutdown"""
+    global _shared_transport
+    if _shared_transport is not None:
+        await _shared_transport.aclose()
+        _shared_transport = None
+
 class BaseAPIClient(ABC):
     """Base class for all API clients"""
     
     def __init__(self, base_url: str, timeout: int = 30):
         self.base_url = base_url
         self.timeout = timeout
-        self.client = httpx.AsyncClient(timeout=timeout)
+        # Each client keeps its own headers/timeouts but shares the connection pool
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout, connect=5.0),
+            transport=get_shared_transport()
+        )
     
     @abstractmethod
     async def search(self, query: str, year_start: int, year_end: int, 
@@ -59,5 +101,9 @@ class BaseAPIClient(ABC):
         return is_oa, reason
     
     async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+        """Close the HTTP client
+        
+        The underlying connection pool is shared with the other API clients and
+        is closed separately by close_shared_transport().
+        """
+        pass
\ No newline at end of file
@@ -27,14 +27,15 @@ class BioMedCentralClient(BaseAPIClient):
     
     async def _wait_for_rate_limit(self):
         """Rate limiting"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
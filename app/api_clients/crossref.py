@@ -1,5 +1,4 @@
 from typing import List, Dict, Any, Optional
-import httpx
 from app.api_clients.base import BaseAPIClient
 from app.models import Paper
 from app.utils.open_access_validator import open_access_validator
@@ -25,14 +24,15 @@ class CrossrefClient(BaseAPIClient):
     
     async def _wait_for_rate_limit(self):
         """Ensure we don't overwhelm Crossref API"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
@@ -296,34 +296,33 @@ class CrossrefClient(BaseAPIClient):
                     url = f"https://api.unpaywall.org/v2/{paper.doi}"
                     params = {"email": "research@openscholar.app"}
                     
-                    async with httpx.AsyncClient() as client:
-                        response = await client.get(url, params=params, timeout=5.0)
+                    response = await self.client.get(url, params=params, timeout=5.0)
+                    
+                    if response.status_code == 200:
+                        data = response.json()
                         
-                        if response.status_code == 200:
-                            data = response.json()
+                        # If OA version found, update the URL
+                        if data.get("is_oa") and data.get("oa_locations"):
+                            # Get best OA location
+                            best_location = None
+                            for loc in data["oa_locations"]:
+                                if loc.get("url_for_pdf"):
+                                    best_location = loc
+                                    break
+                                elif not best_location and loc.get("url"):
+                                    best_location = loc
                             
-                            # If OA version found, update the URL
-                            if data.get("is_oa") and data.get("oa_locations"):
-                                # Get best OA location
-                                best_location = None
-                                for loc in data["oa_locations"]:
-                                    if loc.get("url_for_pdf"):
-                                        best_location = loc
-                                        break
-                                    elif not best_location and loc.get("url"):
-                                        best_location = loc
-                                
-                                if best_location:
-                                    pdf_url = best_location.get("url_for_pdf") or best_location.get("url")
-                                    if pdf_url:
-                                        paper.full_text_url = pdf_url
-                                        logger.debug(f"Found Unpaywall URL for: {paper.title[:50]}...")
-                                        
-                                        # Add OA location info to abstract
-                                        location_type = best_location.get("host_type", "")
-                                        if location_type:
-                                            paper.abstract += f"\n\n[Open Access: {location_type}]"
-                
+                            if best_location:
+                                pdf_url = best_location.get("url_for_pdf") or best_location.get("url")
+                                if pdf_url:
+                                    paper.full_text_url = pdf_url
+                                    logger.debug(f"Found Unpaywall URL for: {paper.title[:50]}...")
+                                    
+                                    # Add OA location info to abstract
+                                    location_type = best_location.get("host_type", "")
+                                    if location_type:
+                                        paper.abstract += f"\n\n[Open Access: {location_type}]"
+            
                 except Exception as e:
                     logger.debug(f"Error checking Unpaywall for DOI {paper.doi}: {e}")
                 
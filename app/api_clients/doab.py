@@ -1,5 +1,4 @@
 from typing import List, Dict, Any, Optional
-import httpx
 from app.api_clients.base import BaseAPIClient
 from app.models import Paper
 import logging
@@ -25,57 +24,57 @@ class DOABClient(BaseAPIClient):
     
     async def _wait_for_rate_limit(self):
         """Ensure we don't overwhelm DOAB API"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def extract_pdf_url_from_handle(self, handle_url: str) -> Optional[str]:
         """Extract PDF download URL from DOAB handle page"""
         try:
             # Fetch the handle page
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(handle_url)
-                response.raise_for_status()
-                
-                # Parse HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Look for download links
-                # DOAB pages typically have download links in a specific pattern
-                # Look for links containing "bitstream" and ending with ".pdf"
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
-                    if 'bitstream' in href and href.endswith('.pdf'):
-                        # Convert relative URLs to absolute
-                        if href.startswith('http'):
-                            return href
-                        elif href.startswith('/'):
-                            # Extract base URL from handle_url
-                            base_url = '/'.join(handle_url.split('/')[:3])
-                            return base_url + href
-                        else:
-                            # Relative to current directory
-                            base_path = '/'.join(handle_url.split('/')[:-1])
-                            return base_path + '/' + href
-                
-                # Alternative: Look for links with "Download" text
-                for link in soup.find_all('a', string=re.compile(r'Download.*PDF', re.I)):
-                    href = link.get('href', '')
-                    if href:
-                        if href.startswith('http'):
-                            return href
-                        elif href.startswith('/'):
-                            base_url = '/'.join(handle_url.split('/')[:3])
-                            return base_url + href
-                
-                logger.warning(f"No PDF URL found on handle page: {handle_url}")
-                return None
-                
+            response = await self.client.get(handle_url, headers={"Accept": "*/*"}, timeout=10.0)
+            response.raise_for_status()
+            
+            # Parse HTML
+            soup = BeautifulSoup(response.text, 'html.parser')
+            
+            # Look for download links
+            # DOAB pages typically have download links in a specific pattern
+            # Look for links containing "bitstream" and ending with ".pdf"
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                if 'bitstream' in href and href.endswith('.pdf'):
+                    # Convert relative URLs to absolute
+                    if href.startswith('http'):
+                        return href
+                    elif href.startswith('/'):
+                        # Extract base URL from handle_url
+                        base_url = '/'.join(handle_url.split('/')[:3])
+                        return base_url + href
+                    else:
+                        # Relative to current directory
+                        base_path = '/'.join(handle_url.split('/')[:-1])
+                        return base_path + '/' + href
+            
+            # Alternative: Look for links with "Download" text
+            for link in soup.find_all('a', string=re.compile(r'Download.*PDF', re.I)):
+                href = link.get('href', '')
+                if href:
+                    if href.startswith('http'):
+                        return href
+                    elif href.startswith('/'):
+                        base_url = '/'.join(handle_url.split('/')[:3])
+                        return base_url + href
+            
+            logger.warning(f"No PDF URL found on handle page: {handle_url}")
+            return None
+            
         except Exception as e:
             logger.error(f"Error extracting PDF URL from {handle_url}: {e}")
             return None
@@ -1,12 +1,75 @@
 from typing import List, Dict, Any, Optional
+from contextlib import aclosing
+from functools import lru_cache
 import httpx
 from app.api_clients.base import BaseAPIClient
+from app.api_clients.http import iter_json_items
 from app.models import Paper
 import logging
 import re
 
 logger = logging.getLogger(__name__)
 
+# Extra search terms for supported disciplines and education levels
+DISCIPLINE_MAPPING = {
+    "education": "education OR pedagogy",
+    "psychology": "psychology OR cognitive",
+    "child development": "child development OR pediatric development",
+    "early childhood": "early childhood OR preschool"
+}
+
+LEVEL_MAPPING = {
+    "early childhood": "early childhood OR preschool OR kindergarten",
+    "k-12": "K-12 OR elementary OR secondary education",
+    "higher ed": "higher education OR university OR college"
+}
+
+# Filters added to every query, joined once at import
+_STATIC_FILTERS = " AND " + " AND ".join([
+    "OPEN_ACCESS:y",
+    "LICENSE:cc*",  # Only Creative Commons licensed content
+    "HAS_PDF:y",  # Only papers with PDF available
+    "FIRST_PDATE:[2000-01-01 TO 2025-12-31]",  # Filter out very old partial records
+])
+
+# PMC ids in NCBI article URLs, with and without a trailing path segment
+_PMC_PDF_ID_RE = re.compile(r'/PMC(\d+)/')
+_PMC_ID_RE = re.compile(r'/PMC(\d+)')
+
+# Separator in authorString ("Smith J, Doe J.")
+_AUTHOR_SPLIT_RE = re.compile(r'\s*,\s*')
+
+# Europe PMC's direct PDF download endpoint, keyed by PMC id
+_PMC_RENDER_URL = "https://europepmc.org/backend/ptpmcrender.fcgi?accid={}&blobtype=pdf"
+
+_PDF_DOC_STYLES = frozenset({"pdf", "epdf"})
+
+# Publication types that are never full research articles
+_REJECT_PUBTYPES = frozenset({"abstract", "editorial", "letter", "comment", "erratum"})
+
+# URL path or query markers of abstract-only pages, matched in one pass
+_ABSTRACT_URL_RE = re.compile(r'[/?&](?:abstract|summary)', re.IGNORECASE)
+
+@lru_cache(maxsize=64)
+def _subject_filters(discipline: Optional[str], education_level: Optional[str]) -> str:
+    """Return the " AND (...)" clauses for a discipline/level pair
+
+    Both come from small fixed sets in the UI, so the joined clauses are cached.
+    """
+    fragment = ""
+    
+    if discipline:
+        discipline_terms = DISCIPLINE_MAPPING.get(discipline.lower())
+        if discipline_terms:
+            fragment += f" AND ({discipline_terms})"
+    
+    if education_level:
+        level_terms = LEVEL_MAPPING.get(education_level.lower())
+        if level_terms:
+            fragment += f" AND ({level_terms})"
+    
+    return fragment
+
 class EuropePMCClient(BaseAPIClient):
     """Europe PMC API client for biomedical and life sciences research"""
     
@@ -20,42 +83,15 @@ class EuropePMCClient(BaseAPIClient):
                     limit: int = 20) -> List[Paper]:
         """Search Europe PMC database for papers"""
         
-        # Build search query parts
-        query_parts = [query]
-        
-        # Add open access filter - stricter filtering for true open access
-        query_parts.append("OPEN_ACCESS:y")
-        query_parts.append("LICENSE:cc*")  # Only Creative Commons licensed content
-        query_parts.append("HAS_PDF:y")     # Only papers with PDF available
-        query_parts.append("FIRST_PDATE:[2000-01-01 TO 2025-12-31]")  # Filter out very old partial records
+        # Open access, Creative Commons, PDF available, no very old partial records
+        search_query = query + _STATIC_FILTERS
         
         # Add year range filter
         if year_start and year_end:
-            query_parts.append(f"PUB_YEAR:[{year_start} TO {year_end}]")
+            search_query += f" AND PUB_YEAR:[{year_start} TO {year_end}]"
         
-        # Add discipline-specific terms if provided
-        if discipline:
-            discipline_mapping = {
-                "education": "education OR pedagogy",
-                "psychology": "psychology OR cognitive",
-                "child development": "child development OR pediatric development",
-                "early childhood": "early childhood OR preschool"
-            }
-            if discipline.lower() in discipline_mapping:
-                query_parts.append(f"({discipline_mapping[discipline.lower()]})")
-        
-        # Add education level terms if provided
-        if education_level:
-            level_mapping = {
-                "early childhood": "early childhood OR preschool OR kindergarten",
-                "k-12": "K-12 OR elementary OR secondary education",
-                "higher ed": "higher education OR university OR college"
-            }
-            if education_level.lower() in level_mapping:
-                query_parts.append(f"({level_mapping[education_level.lower()]})")
-        
-        # Combine query parts with AND
-        search_query = " AND ".join(query_parts)
+        # Add discipline and education level terms if provided
+        search_query += _subject_filters(discipline, education_level)
         
         params = {
             "query": search_query,
@@ -65,20 +101,24 @@ class EuropePMCClient(BaseAPIClient):
         }
         
         try:
-            response = await self.client.get(
-                f"{self.base_url}/search",
-                params=params
-            )
-            response.raise_for_status()
-            
-            data = response.json()
             papers = []
             
-            if "resultList" in data and "result" in data["resultList"]:
-                for result in data["resultList"]["result"]:
-                    paper = self.normalize_paper(result)
-                    if paper:
-                        papers.append(paper)
+            # Normalize results while the rest of the page is still downloading
+            async with self.client.stream(
+                "GET",
+                f"{self.base_url}/search",
+                params=params
+            ) as response:
+                response.raise_for_status()
+                
+                async with aclosing(iter_json_items(response, "resultList.result.item")) as results:
+                    async for result in results:
+                        paper = self.normalize_paper(result)
+                        if paper:
+                            papers.append(paper)
+                            # Stop reading as soon as we have enough papers
+                            if len(papers) >= limit:
+                                break
             
             return papers
             
@@ -89,128 +129,123 @@ class EuropePMCClient(BaseAPIClient):
     def normalize_paper(self, raw_paper: Dict[str, Any]) -> Optional[Paper]:
         """Normalize Europe PMC response to Paper model - only return papers with full text"""
         try:
-            # Check license first - only allow Creative Commons or explicit open access
-            license_info = raw_paper.get("license")
-            if license_info:
-                # Only allow Creative Commons licenses or explicit open access
-                if not (license_info.lower().startswith("cc") or "open access" in license_info.lower()):
-                    logger.debug(f"Skipping paper due to restrictive license: {license_info}")
-                    return None
+            # Bound once: normalize_paper runs per result and does ~15 lookups on raw_paper
+            get = raw_paper.get
             
-            # Double-check open access status
-            if raw_paper.get("isOpenAccess") != "Y":
-                logger.debug(f"Skipping paper - not marked as open access")
+            # Cheapest gates first: plain string compares reject most papers
+            # before the license and URL list are looked at
+            if get("isOpenAccess") != "Y":
+                logger.debug("Skipping paper - not marked as open access")
                 return None
             
             # Check if PDF is available
-            has_pdf = raw_paper.get("hasPDF")
-            if has_pdf != "Y":
-                logger.debug(f"Skipping paper - no PDF available")
+            if get("hasPDF") != "Y":
+                logger.debug("Skipping paper - no PDF available")
                 return None
             
             # Check if it's a full research article (not just abstract, editorial, etc.)
-            publication_type = raw_paper.get("pubType", "").lower()
-            if publication_type and publication_type in ["abstract", "editorial", "letter", "comment", "erratum"]:
-                logger.debug(f"Skipping paper - publication type: {publication_type}")
+            publication_type = get("pubType", "").lower()
+            if publication_type in _REJECT_PUBTYPES:
+                logger.debug("Skipping paper - publication type: %s", publication_type)
                 return None
             
-            # Get full text URL - prioritize PDF URLs
+            # Only allow Creative Commons licenses or explicit open access
+            license_info = get("license")
+            if license_info:
+                license_lower = license_info.lower()
+                if not (license_lower.startswith("cc") or "open access" in license_lower):
+                    logger.debug("Skipping paper due to restrictive license: %s", license_info)
+                    return None
+            
+            # Get full text URL - prioritize PDF URLs, then PMC URLs, then the first URL
             full_text_url = None
-            if "fullTextUrlList" in raw_paper and raw_paper["fullTextUrlList"]:
-                url_list = raw_paper["fullTextUrlList"].get("fullTextUrl", [])
-                if url_list and len(url_list) > 0:
-                    # First priority: Look for PDF URLs but convert to proper format
-                    for url_obj in url_list:
-                        doc_style = url_obj.get("documentStyle", "").lower()
-                        if doc_style in ["pdf", "epdf"]:
-                            url = url_obj.get("url", "")
-                            # Convert NCBI URLs to Europe PMC direct PDF URLs
-                            if "/pmc/articles/PMC" in url and "/pdf/" in url:
-                                # Extract PMC ID from URL
-                                pmc_match = re.search(r'/PMC(\d+)/', url)
-                                if pmc_match:
-                                    pmc_id = f"PMC{pmc_match.group(1)}"
-                                    full_text_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={pmc_id}&blobtype=pdf"
-                                    break
-                            else:
-                                full_text_url = url
-                                break
-                    
-                    # Second priority: PMC URLs (if no PDF found)
-                    if not full_text_url:
-                        for url_obj in url_list:
-                            url = url_obj.get("url", "")
-                            if "pmc" in url.lower() or "europepmc.org" in url.lower():
-                                # Extract PMC ID from various URL formats
-                                pmc_id = None
-                                if "/PMC" in url:
-                                    pmc_id = "PMC" + url.split("/PMC")[1].split("/")[0].split("?")[0]
-                                elif "pmcid=" in url:
-                                    pmc_id = url.split("pmcid=")[1].split("&")[0]
-                                
-                                if pmc_id:
-                                    # Use Europe PMC direct PDF download URL
-                                    full_text_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={pmc_id}&blobtype=pdf"
-                                    break
+            url_list = (get("fullTextUrlList") or {}).get("fullTextUrl") or []
+            if url_list:
+                pdf_url = pmc_url = None
+                pdf_search_done = False
+                for url_obj in url_list:
+                    url = url_obj.get("url", "")
                     
-                    # Third priority: use first available URL but convert if needed
-                    if not full_text_url and url_list:
-                        url = url_list[0].get("url", "")
-                        # Check if it's an NCBI PMC URL that needs conversion
-                        if "/pmc/articles/PMC" in url:
-                            pmc_match = re.search(r'/PMC(\d+)', url)
+                    if not pdf_search_done and url_obj.get("documentStyle", "").lower() in _PDF_DOC_STYLES:
+                        # Convert NCBI URLs to Europe PMC direct PDF URLs
+                        if "/pmc/articles/PMC" in url and "/pdf/" in url:
+                            pmc_match = _PMC_PDF_ID_RE.search(url)
                             if pmc_match:
-                                pmc_id = f"PMC{pmc_match.group(1)}"
-                                full_text_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={pmc_id}&blobtype=pdf"
-                            else:
-                                full_text_url = url
+                                pdf_url = _PMC_RENDER_URL.format(f"PMC{pmc_match.group(1)}")
+                                break
+                        elif url:
+                            pdf_url = url
+                            break
                         else:
-                            full_text_url = url
+                            # A PDF entry without a URL ends the PDF search
+                            pdf_search_done = True
+                    
+                    # Remember the first PMC URL in case no PDF URL turns up
+                    if pmc_url is None and "pmc" in url.lower():
+                        pmc_id = None
+                        if "/PMC" in url:
+                            pmc_id = "PMC" + url.split("/PMC")[1].split("/")[0].split("?")[0]
+                        elif "pmcid=" in url:
+                            pmc_id = url.split("pmcid=")[1].split("&")[0]
+                        if pmc_id:
+                            pmc_url = _PMC_RENDER_URL.format(pmc_id)
+                
+                full_text_url = pdf_url or pmc_url
+                if not full_text_url:
+                    # Fall back to the first URL, converting NCBI PMC URLs if possible
+                    url = url_list[0].get("url", "")
+                    pmc_match = _PMC_ID_RE.search(url) if "/pmc/articles/PMC" in url else None
+                    full_text_url = _PMC_RENDER_URL.format(f"PMC{pmc_match.group(1)}") if pmc_match else url
             
             # Alternative: Check if PMC ID exists and construct PDF URL directly
-            if not full_text_url and raw_paper.get("pmcid"):
+            pmcid = get("pmcid")
+            if not full_text_url and pmcid:
                 # Use Europe PMC direct PDF download URL
-                full_text_url = f"https://europepmc.org/backend/ptpmcrender.fcgi?accid={raw_paper['pmcid']}&blobtype=pdf"
+                full_text_url = _PMC_RENDER_URL.format(pmcid)
             
             # Skip if no full text available
             if not full_text_url:
-                logger.debug(f"Skipping paper - no full text URL available")
+                logger.debug("Skipping paper - no full text URL available")
                 return None
             
             # Validate that URL points to a full article, not just abstract
             if self._is_abstract_only_url(full_text_url):
-                logger.debug(f"Skipping paper - URL appears to be abstract-only: {full_text_url}")
+                logger.debug("Skipping paper - URL appears to be abstract-only: %s", full_text_url)
                 return None
             
             # Extract authors
             authors = []
-            if "authorString" in raw_paper and raw_paper["authorString"]:
-                # Split by comma and clean up
-                authors = [author.strip() for author in raw_paper["authorString"].split(",")]
+            author_string = get("authorString")
+            if author_string:
+                # Split on commas, swallowing the surrounding whitespace in the same pass
+                authors = _AUTHOR_SPLIT_RE.split(author_string.strip())
             
             # Get abstract
-            abstract = raw_paper.get("abstractText", "")
+            abstract = get("abstractText", "")
             if not abstract:
-                abstract = raw_paper.get("abstract", "")
+                abstract = get("abstract", "")
             
             # Get DOI
-            doi = raw_paper.get("doi")
+            doi = get("doi")
             
             # Get journal
-            journal = raw_paper.get("journalTitle", "")
+            journal = get("journalTitle", "")
             if not journal:
-                journal = raw_paper.get("journal", {}).get("title", "")
+                journal = get("journal", {}).get("title", "")
             
-            return Paper(
-                title=raw_paper.get("title", "").strip(),
+            pub_year = get("pubYear")
+            
+            # Fields come straight from typed Europe PMC JSON, so skip validation
+            return Paper.model_construct(
+                title=get("title", "").strip(),
                 authors=authors,
                 abstract=abstract.strip(),
-                year=str(raw_paper.get("pubYear", "Unknown")) if raw_paper.get("pubYear") else "Unknown",
+                year=str(pub_year) if pub_year else "Unknown",
                 source="Europe PMC",
                 full_text_url=full_text_url,
                 doi=doi,
                 journal=journal,
-                citation_count=raw_paper.get("citedByCount")
+                citation_count=get("citedByCount")
             )
         except Exception as e:
             logger.error(f"Error normalizing Europe PMC paper: {e}")
@@ -218,23 +253,4 @@ class EuropePMCClient(BaseAPIClient):
     
     def _is_abstract_only_url(self, url: str) -> bool:
         """Check if URL appears to be abstract-only rather than full text"""
-        abstract_indicators = [
-            "/abstract",
-            "?abstract",
-            "&abstract",
-            "/summary",
-            "?summary",
-            "&summary"
-        ]
-        
-        # Check for abstract indicators in URL
-        url_lower = url.lower()
-        for indicator in abstract_indicators:
-            if indicator in url_lower:
-                return True
-        
-        # PMC URLs should have the full article path
-        if "pmc/articles/" in url_lower and not url_lower.endswith("/"):
-            return False
-        
-        return False
\ No newline at end of file
+        return _ABSTRACT_URL_RE.search(url) is not None
\ No newline at end of file
@@ -1,47 +1,57 @@
 from typing import List, Dict, Any, Optional
 import httpx
 from app.api_clients.base import BaseAPIClient
+from app.api_clients.http import read_json
 from app.models import Paper
+from aiolimiter import AsyncLimiter
 import logging
-import asyncio
-import time
 import re
 from urllib.parse import quote_plus
 
 logger = logging.getLogger(__name__)
 
+# Description cleanup and year extraction, compiled once for every converted book
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_YEAR_RE = re.compile(r'(\d{4})')
+
+# Map disciplines to Google Books subject categories
+SUBJECT_MAPPING = {
+    "science": "subject:Science",
+    "medicine": "subject:Medical",
+    "psychology": "subject:Psychology",
+    "education": "subject:Education",
+    "history": "subject:History",
+    "philosophy": "subject:Philosophy",
+    "literature": "subject:Literary+Criticism",
+    "mathematics": "subject:Mathematics",
+    "biology": "subject:Science",
+    "chemistry": "subject:Science",
+    "physics": "subject:Science"
+}
+
+_ISBN_TYPES = frozenset({"ISBN_13", "ISBN_10"})
+_NO_ACCESS_VIEWABILITY = frozenset({"NO_PAGES", "NOT_ACCESSIBLE"})
+
 class GoogleBooksClient(BaseAPIClient):
     """Google Books API client - free access, no authentication needed"""
     
     def __init__(self):
         super().__init__(base_url="https://www.googleapis.com/books/v1")
-        self.last_request_time = 0
-        self.min_request_interval = 0.2  # Be polite to Google
+        # Token bucket: concurrent searches may burst, but stay within 5 requests/second
+        self._limiter = AsyncLimiter(max_rate=5, time_period=1.0)
         
         self.client.headers.update({
             "User-Agent": "OpenScholar Research Tool/1.0 (mailto:research@openscholar.app)",
             "Accept": "application/json"
         })
     
-    async def _wait_for_rate_limit(self):
-        """Rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(wait_time)
-        
-        self.last_request_time = time.time()
-    
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
                     education_level: Optional[str] = None,
                     limit: int = 20) -> List[Paper]:
         """Search Google Books for academic books and texts"""
         
-        await self._wait_for_rate_limit()
-        
         try:
             # Build search query - require ALL terms to match
             # Split query into terms and join with + for Google Books (requires all terms)
@@ -66,36 +76,22 @@ class GoogleBooksClient(BaseAPIClient):
             
             # Add subject filter if discipline specified
             if discipline:
-                # Map disciplines to Google Books subject categories
-                subject_map = {
-                    "science": "subject:Science",
-                    "medicine": "subject:Medical",
-                    "psychology": "subject:Psychology", 
-                    "education": "subject:Education",
-                    "history": "subject:History",
-                    "philosophy": "subject:Philosophy",
-                    "literature": "subject:Literary+Criticism",
-                    "mathematics": "subject:Mathematics",
-                    "biology": "subject:Science",
-                    "chemistry": "subject:Science",
-                    "physics": "subject:Science"
-                }
-                
-                subject_filter = subject_map.get(discipline.lower())
+                subject_filter = SUBJECT_MAPPING.get(discipline.lower())
                 if subject_filter:
                     params["q"] += f" {subject_filter}"
             
             logger.info(f"Searching Google Books for: {query}")
             
-            response = await self.client.get(f"{self.base_url}/volumes", params=params, timeout=15.0)
-            response.raise_for_status()
+            async with self._limiter:
+                async with self.client.stream("GET", f"{self.base_url}/volumes", params=params, timeout=15.0) as response:
+                    response.raise_for_status()
+                    data = await read_json(response)
             
-            data = response.json()
             items = data.get("items", [])
             
             papers = []
             for item in items:
-                paper = await self._book_to_paper(item, year_start, year_end, discipline)
+                paper = self._book_to_paper(item, year_start, year_end, discipline)
                 if paper:
                     papers.append(paper)
                     if len(papers) >= limit:
@@ -108,7 +104,7 @@ class GoogleBooksClient(BaseAPIClient):
             logger.error(f"Error searching Google Books: {e}")
             return []
     
-    async def _book_to_paper(self, item: Dict[str, Any], year_start: int, year_end: int, discipline: Optional[str] = None) -> Optional[Paper]:
+    def _book_to_paper(self, item: Dict[str, Any], year_start: int, year_end: int, discipline: Optional[str] = None) -> Optional[Paper]:
         """Convert Google Books item to Paper object"""
         try:
             volume_info = item.get("volumeInfo", {})
@@ -118,25 +114,11 @@ class GoogleBooksClient(BaseAPIClient):
             if not title:
                 return None
             
-            # Get authors
-            authors = volume_info.get("authors", [])
-            if not authors:
-                authors = ["Unknown"]
-            
-            # Get description/abstract
-            description = volume_info.get("description", "")
-            if not description:
-                description = f"Book from Google Books: {title}"
-            
-            # Clean HTML from description
-            description = re.sub(r'<[^>]+>', '', description)
-            description = re.sub(r'\s+', ' ', description).strip()
-            
-            # Get publication year
+            # Get publication year - cheap rejects come before any text cleanup
             published_date = volume_info.get("publishedDate", "")
             year = ""
             if published_date:
-                year_match = re.search(r'(\d{4})', published_date)
+                year_match = _YEAR_RE.search(published_date)
                 if year_match:
                     year = year_match.group(1)
             
@@ -145,41 +127,17 @@ class GoogleBooksClient(BaseAPIClient):
                 return None
             
             # Apply year filter
-            if year and year_start and year_end:
-                try:
-                    year_int = int(year)
-                    if year_int < year_start or year_int > year_end:
-                        return None
-                except ValueError:
-                    pass
-            
-            # Get publisher
-            publisher = volume_info.get("publisher", "")
-            
-            # Get page count
-            page_count = volume_info.get("pageCount")
-            
-            # Get language
-            language = volume_info.get("language", "en")
-            
-            # Get categories/subjects
-            categories = volume_info.get("categories", [])
-            subjects = categories[:5] if categories else []
-            
-            # Get identifiers for ISBN
-            isbn = None
-            identifiers = volume_info.get("industryIdentifiers", [])
-            for identifier in identifiers:
-                if identifier.get("type") in ["ISBN_13", "ISBN_10"]:
-                    isbn = identifier.get("identifier")
-                    break
+            if year_start and year_end:
+                year_int = int(year)
+                if year_int < year_start or year_int > year_end:
+                    return None
             
             # Include books with reasonable access
             access_info = item.get("accessInfo", {})
             
             # Check if book has some view access (not just ALL_PAGES)
             viewability = access_info.get("viewability", "")
-            if viewability in ["NO_PAGES", "NOT_ACCESSIBLE"]:
+            if viewability in _NO_ACCESS_VIEWABILITY:
                 return None  # Skip completely inaccessible books
             
             # Get full text URL - prefer web reader, fallback to preview
@@ -191,6 +149,37 @@ class GoogleBooksClient(BaseAPIClient):
             if not full_text_url:
                 return None  # Must have some kind of link
             
+            # Get authors
+            authors = volume_info.get("authors", [])
+            if not authors:
+                authors = ["Unknown"]
+            
+            # Get description/abstract
+            description = volume_info.get("description", "")
+            if not description:
+                description = f"Book from Google Books: {title}"
+            
+            # Clean HTML from description (plain-text descriptions skip the tag pass)
+            if "<" in description:
+                description = _HTML_TAG_RE.sub('', description)
+            description = _WS_RE.sub(' ', description).strip()
+            
+            # Get publisher
+            publisher = volume_info.get("publisher", "")
+            
+            # Get page count
+            page_count = volume_info.get("pageCount")
+            
+            # Get language
+            language = volume_info.get("language", "en")
+            
+            # Get identifiers for ISBN
+            isbn = next((
+                identifier.get("identifier")
+                for identifier in volume_info.get("industryIdentifiers", [])
+                if identifier.get("type") in _ISBN_TYPES
+            ), None)
+            
             # Determine download formats based on access
             download_formats = ["Online"]
             if access_info.get("pdf", {}).get("isAvailable"):
@@ -198,11 +187,12 @@ class GoogleBooksClient(BaseAPIClient):
             if access_info.get("epub", {}).get("isAvailable"):
                 download_formats.append("EPUB")
             
-            return Paper(
+            # Fields are typed values from the Google Books volume JSON, so skip validation
+            return Paper.model_construct(
                 title=title,
                 authors=authors[:10],  # Limit authors
                 abstract=description[:1500],  # Limit description length
-                year=str(year) if year is not None else "Unknown",
+                year=year,  # Already a 4-digit string from _YEAR_RE
                 source="Google Books",
                 full_text_url=full_text_url,
                 doi=None,
@@ -214,7 +204,7 @@ class GoogleBooksClient(BaseAPIClient):
                 publisher=publisher,
                 page_count=page_count,
                 language=language,
-                subjects=subjects if subjects else None,
+                subjects=volume_info.get("categories", [])[:5] or None,
                 download_formats=download_formats
             )
             
@@ -222,6 +212,6 @@ class GoogleBooksClient(BaseAPIClient):
             logger.error(f"Error converting Google Books item to paper: {e}")
             return None
     
-    async def normalize_paper(self, raw_item: Dict[str, Any], year_start: int = 0, year_end: int = 0) -> Optional[Paper]:
+    def normalize_paper(self, raw_item: Dict[str, Any], year_start: int = 0, year_end: int = 0) -> Optional[Paper]:
         """Compatibility method"""
-        return await self._book_to_paper(raw_item, year_start, year_end)
\ No newline at end of file
+        return self._book_to_paper(raw_item, year_start, year_end)
\ No newline at end of file
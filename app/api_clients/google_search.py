@@ -1,16 +1,62 @@
 from typing import List, Dict, Any, Optional
 import httpx
 from app.api_clients.base import BaseAPIClient
+from app.api_clients.http import json_loads, retry_delay, RETRY_STATUS_CODES
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
+from aiolimiter import AsyncLimiter
 import logging
 import asyncio
-import time
 import re
+import time
+from functools import lru_cache
 from urllib.parse import quote_plus, urlparse
 import os
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 20
+
+# CSE request rate; halved for RATE_LIMIT_COOLDOWN seconds after each 429
+REQUESTS_PER_SECOND = 10
+MIN_REQUESTS_PER_SECOND = 1
+RATE_LIMIT_COOLDOWN = 60.0
+
+# Raw result pages by (engine, query, start, num); CSE calls are billable and slow
+PAGE_CACHE_TTL = 6 * 3600
+_page_cache = TTLCache(maxsize=1024, ttl=PAGE_CACHE_TTL)
+
+# Known problematic PDF hosts, matched as the host itself or any subdomain of it
+_BLOCKED_DOMAINS = frozenset({
+    'researchgate.net',  # Often requires login
+    'academia.edu',      # Often requires login
+    'jstor.org',         # Paywall
+    'springer.com',      # Often paywall
+    'elsevier.com',      # Often paywall
+    'wiley.com',         # Often paywall
+    'nature.com',        # Often paywall
+    'sciencedirect.com', # Paywall
+})
+_BLOCKED_SUFFIXES = tuple("." + domain for domain in _BLOCKED_DOMAINS)
+
+@lru_cache(maxsize=4096)
+def _is_blocked_url(url: str) -> bool:
+    """Whether the URL is hosted on a blocked domain; cached as cached pages repeat links"""
+    host = urlparse(url).hostname or ""
+    return host in _BLOCKED_DOMAINS or host.endswith(_BLOCKED_SUFFIXES)
+
+# Result parsing patterns, compiled once for every result of every search
+_PDF_MARKER_RE = re.compile(r'\[PDF\]|\(PDF\)|\.pdf$', re.IGNORECASE)
+_META_YEAR_RE = re.compile(r'(\d{4})')
+_TEXT_YEAR_RE = re.compile(r'\b(19\d{2}|20[0-3]\d)\b')
+
+# Common author patterns
+_AUTHOR_PATTERNS = [
+    re.compile(r'by\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE),  # "by John Smith"
+    re.compile(r'author:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)', re.IGNORECASE),  # "author: John Smith"
+    re.compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+et\s+al', re.IGNORECASE),  # "Smith Jones et al"
+]
+
 class GoogleSearchClient(BaseAPIClient):
     """Google Custom Search API client - searches for PDFs only across the web"""
     
@@ -25,25 +71,17 @@ class GoogleSearchClient(BaseAPIClient):
         if not self.search_engine_id:
             self.search_engine_id = os.getenv("GOOGLE_CSE_ID")
         
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # Google allows 100 queries per second
+        # Token bucket: the concurrent page requests of a search may burst, up to 10 per second
+        self._limiter = AsyncLimiter(max_rate=REQUESTS_PER_SECOND, time_period=1.0)
+        self._limiter_reset_at = 0.0
+        # Caps in-flight requests across concurrent searches so they don't queue in the pool
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
         self.client.headers.update({
             "User-Agent": "OpenScholar Research Tool/1.0 (mailto:research@openscholar.app)",
             "Accept": "application/json"
         })
     
-    async def _wait_for_rate_limit(self):
-        """Rate limiting to respect Google's API limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(wait_time)
-        
-        self.last_request_time = time.time()
-    
     async def search(self, query: str, year_start: int = None, year_end: int = None,
                     discipline: Optional[str] = None,
                     education_level: Optional[str] = None,
@@ -54,8 +92,6 @@ class GoogleSearchClient(BaseAPIClient):
             logger.warning("Google Search API credentials not configured")
             return []
         
-        await self._wait_for_rate_limit()
-        
         try:
             # Build search query with PDF filter - return ALL PDFs, not just academic
             search_query = f"{query} filetype:pdf"
@@ -64,55 +100,44 @@ class GoogleSearchClient(BaseAPIClient):
             if discipline:
                 search_query += f" {discipline}"
             
-            # Make multiple requests if needed (Google allows max 10 per request)
-            papers = []
-            requests_needed = min((limit + 9) // 10, 5)  # Max 5 requests to avoid quota issues
+            # Add date range if specified (Google format: after:YYYY-MM-DD before:YYYY-MM-DD)
+            q = search_query
+            if year_start and year_end:
+                q += f" after:{year_start}-01-01 before:{year_end}-12-31"
             
-            for request_num in range(requests_needed):
-                start_index = request_num * 10 + 1
-                per_request = min(10, limit - len(papers))
-                
-                if per_request <= 0:
+            # Google allows max 10 results per request; the pages are independent so
+            # fetch them concurrently (max 5 requests to avoid quota issues)
+            requests_needed = min((limit + 9) // 10, 5)
+            logger.info(f"Searching Google for PDFs ({requests_needed} requests): {search_query}")
+            pages = await asyncio.gather(
+                *(self._fetch_page(q, request_num * 10 + 1, min(10, limit - request_num * 10))
+                  for request_num in range(requests_needed)),
+                return_exceptions=True
+            )
+            
+            papers = []
+            seen_urls = set()  # CSE can repeat a link on overlapping pages
+            for request_num, items in enumerate(pages):
+                if isinstance(items, Exception):
+                    logger.error(f"Error fetching Google results page {request_num + 1}: {items}")
                     break
-                
-                # Build parameters for Google Custom Search
-                params = {
-                    "key": self.api_key,
-                    "cx": self.search_engine_id,
-                    "q": search_query,
-                    "num": per_request,
-                    "start": start_index,
-                    "fileType": "pdf",  # Ensure we only get PDFs
-                    "safe": "active",  # Safe search
-                    "fields": "items(title,link,snippet,displayLink,pagemap,fileFormat)"
-                }
-                
-                # Add date range if specified (Google format: after:YYYY-MM-DD before:YYYY-MM-DD)
-                if year_start and year_end:
-                    date_filter = f"after:{year_start}-01-01 before:{year_end}-12-31"
-                    params["q"] += f" {date_filter}"
-                
-                logger.info(f"Searching Google for PDFs (request {request_num + 1}): {search_query}")
-                
-                response = await self.client.get(self.base_url, params=params, timeout=15.0)
-                response.raise_for_status()
-                
-                data = response.json()
-                items = data.get("items", [])
-                
                 if not items:
                     break  # No more results
                 
                 for item in items:
-                    paper = await self._result_to_paper(item, discipline)
+                    if item.get("link") in seen_urls:
+                        continue
+                    paper = self._result_to_paper(item, discipline)
                     if paper:
                         # Google Search already filters for PDFs and excludes paywall domains
                         # So we can add all results without additional validation
+                        seen_urls.add(paper.full_text_url)
                         papers.append(paper)
+                        if len(papers) >= limit:
+                            break
                 
-                # Rate limiting between requests
-                if request_num < requests_needed - 1:
-                    await self._wait_for_rate_limit()
+                if len(papers) >= limit:
+                    break
             
             logger.info(f"Google Search returned {len(papers)} open access PDFs for query: {query}")
             return papers
@@ -121,25 +146,80 @@ class GoogleSearchClient(BaseAPIClient):
             logger.error(f"Error searching Google for PDFs: {e}")
             return []
     
-    async def _result_to_paper(self, item: Dict[str, Any], discipline: Optional[str] = None) -> Optional[Paper]:
+    async def _fetch_page(self, q: str, start_index: int, num: int) -> List[Dict[str, Any]]:
+        """Fetch one page of Google Custom Search results
+        
+        Pages are kept in _page_cache for PAGE_CACHE_TTL, so repeat searches
+        skip the billable CSE call entirely.
+        """
+        cache_key = (self.search_engine_id, q, start_index, num)
+        items = _page_cache.get(cache_key)
+        if items is not None:
+            return items
+        
+        params = {
+            "key": self.api_key,
+            "cx": self.search_engine_id,
+            "q": q,
+            "num": num,
+            "start": start_index,
+            "fileType": "pdf",  # Ensure we only get PDFs
+            "safe": "active",  # Safe search
+            "fields": "items(title,link,snippet,displayLink,pagemap,fileFormat)"
+        }
+        
+        response = await self._get_with_retry(self.base_url, params)
+        
+        data = json_loads(response.content)
+        items = data.get("items", [])
+        _page_cache.set(cache_key, items)
+        return items
+    
+    async def _get_with_retry(self, url: str, params: Dict[str, Any], attempts: int = 4) -> httpx.Response:
+        """GET under the rate limiter, retrying 429/5xx responses with backoff
+        
+        A 429 also slows this client down for RATE_LIMIT_COOLDOWN seconds, so
+        the remaining pages of a burst don't hit the quota again.
+        """
+        for attempt in range(attempts):
+            if self._limiter_reset_at and time.monotonic() >= self._limiter_reset_at:
+                self._limiter = AsyncLimiter(max_rate=REQUESTS_PER_SECOND, time_period=1.0)
+                self._limiter_reset_at = 0.0
+            
+            async with self._semaphore, self._limiter:
+                response = await self.client.get(url, params=params, timeout=15.0)
+            
+            if response.status_code not in RETRY_STATUS_CODES or attempt == attempts - 1:
+                response.raise_for_status()
+                return response
+            
+            if response.status_code == 429:
+                self._slow_down()
+            delay = retry_delay(response, attempt)
+            logger.warning(f"Google Search returned {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
+    def _slow_down(self):
+        """Halve the request rate until RATE_LIMIT_COOLDOWN seconds pass without a 429"""
+        rate = max(self._limiter.max_rate / 2, MIN_REQUESTS_PER_SECOND)
+        self._limiter = AsyncLimiter(max_rate=rate, time_period=1.0)
+        self._limiter_reset_at = time.monotonic() + RATE_LIMIT_COOLDOWN
+    
+    def _result_to_paper(self, item: Dict[str, Any], discipline: Optional[str] = None) -> Optional[Paper]:
         """Convert Google search result to Paper object"""
         try:
+            # Validate the PDF URL first - it is the cheapest check and rejects the most
+            pdf_url = item.get("link", "")
+            if not self._is_valid_pdf_url(pdf_url):
+                return None
+            
             # Get title
             title = item.get("title", "").strip()
             if not title:
                 return None
             
             # Clean title (remove [PDF] markers etc)
-            title = re.sub(r'\[PDF\]|\(PDF\)|\.pdf$', '', title, flags=re.IGNORECASE).strip()
-            
-            # Get PDF URL
-            pdf_url = item.get("link", "")
-            if not pdf_url or not pdf_url.lower().endswith('.pdf'):
-                return None
-            
-            # Validate URL
-            if not self._is_valid_pdf_url(pdf_url):
-                return None
+            title = _PDF_MARKER_RE.sub('', title).strip()
             
             # Get snippet/abstract
             snippet = item.get("snippet", "")
@@ -147,16 +227,12 @@ class GoogleSearchClient(BaseAPIClient):
                 snippet = f"PDF document from {item.get('displayLink', 'Google Search')}: {title}"
             
             # Clean snippet
-            snippet = re.sub(r'\s+', ' ', snippet).strip()
+            snippet = ' '.join(snippet.split())
             
             # Extract basic metadata from title and snippet
             authors = self._extract_authors_from_text(title, snippet)
             year = self._extract_year_from_text(title, snippet)
             
-            # Determine source domain
-            display_link = item.get("displayLink", "")
-            domain = urlparse(pdf_url).netloc if pdf_url else display_link
-            
             # Try to extract additional metadata from pagemap
             pagemap = item.get("pagemap", {})
             meta_tags = pagemap.get("metatags", [{}])[0] if pagemap.get("metatags") else {}
@@ -171,7 +247,7 @@ class GoogleSearchClient(BaseAPIClient):
             if not year:
                 meta_date = meta_tags.get("date") or meta_tags.get("dc.date") or meta_tags.get("publication_date")
                 if meta_date:
-                    year_match = re.search(r'(\d{4})', meta_date)
+                    year_match = _META_YEAR_RE.search(meta_date)
                     if year_match:
                         year = year_match.group(1)
             
@@ -181,7 +257,8 @@ class GoogleSearchClient(BaseAPIClient):
             if not year:
                 year = "Unknown"
             
-            return Paper(
+            # Every field is a str built above from the CSE item, so skip validation
+            return Paper.model_construct(
                 title=title,
                 authors=authors,
                 abstract=snippet[:1500],  # Limit snippet length
@@ -214,42 +291,20 @@ class GoogleSearchClient(BaseAPIClient):
         if not url.lower().endswith('.pdf'):
             return False
         
-        # Skip known problematic domains
-        blocked_domains = [
-            'researchgate.net',  # Often requires login
-            'academia.edu',      # Often requires login
-            'jstor.org',         # Paywall
-            'springer.com',      # Often paywall
-            'elsevier.com',      # Often paywall
-            'wiley.com',         # Often paywall
-            'nature.com',        # Often paywall
-            'sciencedirect.com', # Paywall
-        ]
-        
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-        
-        # Check if domain contains any blocked domain
-        for blocked in blocked_domains:
-            if blocked in domain:
-                return False
+        # Skip known problematic domains and their subdomains
+        if _is_blocked_url(url):
+            return False
         
         return True
     
     def _extract_authors_from_text(self, title: str, snippet: str) -> List[str]:
         """Extract author names from title and snippet"""
-        text = f"{title} {snippet}".lower()
-        
-        # Common author patterns
-        author_patterns = [
-            r'by\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "by John Smith"
-            r'author:?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # "author: John Smith"
-            r'([A-Z][a-z]+\s+[A-Z][a-z]+)\s+et\s+al',  # "Smith Jones et al"
-        ]
+        # Patterns are case-insensitive and names are title-cased, so no lowercasing is needed
+        text = f"{title} {snippet}"
         
         authors = []
-        for pattern in author_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _AUTHOR_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 if isinstance(match, str) and len(match.split()) <= 3:  # Reasonable name length
                     authors.append(match.title())
@@ -262,8 +317,7 @@ class GoogleSearchClient(BaseAPIClient):
         text = f"{title} {snippet}"
         
         # Look for 4-digit years (1900-2030)
-        year_pattern = r'\b(19\d{2}|20[0-3]\d)\b'
-        matches = re.findall(year_pattern, text)
+        matches = _TEXT_YEAR_RE.findall(text)
         
         if matches:
             # Return the most recent reasonable year
@@ -275,6 +329,6 @@ class GoogleSearchClient(BaseAPIClient):
         
         return None
     
-    async def normalize_paper(self, raw_item: Dict[str, Any]) -> Optional[Paper]:
+    def normalize_paper(self, raw_item: Dict[str, Any]) -> Optional[Paper]:
         """Compatibility method"""
-        return await self._result_to_paper(raw_item)
\ No newline at end of file
+        return self._result_to_paper(raw_item)
\ No newline at end of file
@@ -1,12 +1,134 @@
 import httpx
 import asyncio
+import json
 import logging
+import random
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator
+from app.api_clients.base import get_shared_transport
 
 logger = logging.getLogger(__name__)
 
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# orjson decodes straight from bytes and is several times faster than stdlib json
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# Upper bound on a decoded API response body; larger bodies are refused
+MAX_RESPONSE_BYTES = 20_000_000
+
+# Transient statuses worth retrying, and the backoff applied between attempts
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+_json_client: httpx.AsyncClient | None = None
+_json_client_transport: httpx.AsyncHTTPTransport | None = None
+
+def _shared_json_client() -> httpx.AsyncClient:
+    """Return a long-lived client on the shared pool, rebuilt if the pool was recycled"""
+    global _json_client, _json_client_transport
+    transport = get_shared_transport()
+    if _json_client is None or _json_client_transport is not transport:
+        _json_client = httpx.AsyncClient(transport=transport, follow_redirects=True)
+        _json_client_transport = transport
+    return _json_client
+
 async def fetch_json(url: str, params: dict | None = None, *, ua: str="OpenScholar/1.0", timeout: float = 20):
+    """GET a URL and decode its JSON body, raising httpx.HTTPStatusError on 4xx/5xx
+    
+    Requests go through the module-level client from _shared_json_client(), so
+    keep-alive connections (and their TLS sessions) are reused across calls.
+    That client is never closed here; it lives as long as the shared transport
+    and is rebuilt on first use after close_shared_transport() recycles the pool.
+    """
     headers = {"User-Agent": ua, "Accept": "application/json"}
-    async with httpx.AsyncClient(timeout=timeout, follow_redirects=True, headers=headers) as cli:
-        r = await cli.get(url, params=params)
-        r.raise_for_status()
-        return r.json()
\ No newline at end of file
+    r = await _shared_json_client().get(url, params=params, headers=headers, timeout=timeout)
+    r.raise_for_status()
+    return json_loads(r.content)
+
+def retry_delay(response: httpx.Response, attempt: int, base: float = RETRY_BASE_DELAY) -> float:
+    """Seconds to wait before retrying a transient failure
+    
+    Honours a Retry-After header (delta-seconds or HTTP date) when the server
+    sends one, otherwise backs off exponentially with jitter. Capped at RETRY_MAX_DELAY.
+    """
+    retry_after = response.headers.get("retry-after", "").strip()
+    if retry_after:
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        try:
+            when = parsedate_to_datetime(retry_after)
+            return min(max((when - datetime.now(timezone.utc)).total_seconds(), 0.0), RETRY_MAX_DELAY)
+        except (TypeError, ValueError):
+            pass
+    return min(base * 2 ** attempt + random.uniform(0, base), RETRY_MAX_DELAY)
+
+class _StreamReader:
+    """Async file-like view of a streaming httpx response, as expected by ijson"""
+
+    def __init__(self, response: httpx.Response, max_bytes: int):
+        self._chunks = response.aiter_bytes()
+        self._remaining = max_bytes
+
+    async def read(self, n: int = -1) -> bytes:
+        if n == 0:
+            return b""
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+        self._remaining -= len(chunk)
+        if self._remaining < 0:
+            raise ValueError("Response body exceeds size limit")
+        return chunk
+
+def _check_declared_size(response: httpx.Response, max_bytes: int):
+    """Refuse a response up front when its Content-Length is already over the limit"""
+    declared = response.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"Response body of {declared} bytes exceeds size limit")
+
+async def read_json(response: httpx.Response, max_bytes: int = MAX_RESPONSE_BYTES) -> Any:
+    """Read and decode a streaming JSON response, refusing bodies over max_bytes
+
+    The limit applies to the decompressed body, so a small gzip payload cannot
+    expand past it either.
+    """
+    _check_declared_size(response, max_bytes)
+    body = bytearray()
+    async for chunk in response.aiter_bytes():
+        body += chunk
+        if len(body) > max_bytes:
+            raise ValueError("Response body exceeds size limit")
+    return json_loads(bytes(body))
+
+async def iter_json_items(response: httpx.Response, prefix: str,
+                          max_bytes: int = MAX_RESPONSE_BYTES) -> AsyncIterator[Any]:
+    """Yield the items of the array at `prefix` (ijson syntax, e.g. "response.docs.item")
+    from a streaming response as they arrive, so callers can stop reading early.
+
+    Bodies over max_bytes raise ValueError. Falls back to reading and parsing
+    the whole body when ijson is not installed.
+    """
+    if IJSON_AVAILABLE:
+        _check_declared_size(response, max_bytes)
+        reader = _StreamReader(response, max_bytes)
+        async for item in ijson.items_async(reader, prefix, use_float=True):
+            yield item
+        return
+
+    data = await read_json(response, max_bytes)
+    for key in prefix.split(".")[:-1]:
+        data = data.get(key) if isinstance(data, dict) else None
+    for item in data or []:
+        yield item
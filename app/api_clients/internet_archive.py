@@ -1,57 +1,86 @@
 from typing import List, Dict, Any, Optional
 import httpx
 from app.api_clients.base import BaseAPIClient
+from app.api_clients.http import json_loads, retry_delay, RETRY_STATUS_CODES
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
+from aiolimiter import AsyncLimiter
 import logging
 import asyncio
-import time
 import re
 import urllib.parse
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_REQUESTS = 5
+
+# Texts/books from freely accessible collections, excluding restricted/preview-only ones
+_BASE_FILTERS = (
+    " AND mediatype:(texts OR books)"
+    " AND (collection:opensource OR collection:gutenberg OR collection:internetarchivebooks)"
+    " AND NOT collection:inlibrary"
+)
+
+# Discipline-specific terms, pre-formatted as the clause appended to the query
+_DISCIPLINE_CLAUSES = {discipline: f" AND ({terms})" for discipline, terms in {
+    "education": "education OR educational OR teaching OR learning OR pedagogy OR school",
+    "psychology": "psychology OR psychological OR cognitive OR behavioral OR mental",
+    "computer science": "computer OR programming OR software OR algorithm OR technology",
+    "mathematics": "mathematics OR math OR statistics OR calculus OR algebra OR geometry",
+    "physics": "physics OR quantum OR mechanics OR thermodynamics OR relativity",
+    "biology": "biology OR biological OR life sciences OR ecology OR evolution",
+    "history": "history OR historical OR civilization OR culture",
+    "literature": "literature OR poetry OR novel OR fiction OR writing",
+    "philosophy": "philosophy OR philosophical OR ethics OR logic OR metaphysics"
+}.items()}
+
+# Fields returned per doc - each one is read by normalize_paper. Formats and
+# descriptions come from the search itself; a per-item /metadata call would
+# cost an extra rate-limited request for every hit
+_SEARCH_FIELDS = ",".join((
+    "identifier", "title", "creator", "description", "date", "publisher",
+    "language", "subject", "format", "downloads", "avg_rating", "num_reviews",
+))
+
+# Raw search results by (query, rows)
+SEARCH_CACHE_TTL = 6 * 3600
+_search_cache = TTLCache(maxsize=512, ttl=SEARCH_CACHE_TTL)
+
+# Item cleanup patterns, compiled once for every item of every search
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_LIFE_DATES_RE = re.compile(r'\s*\(\d{4}-?\d{0,4}\)')  # "Twain, Mark (1835-1910)"
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_FULL_TEXT_FORMAT_RE = re.compile(r'PDF|EPUB|MOBI|TXT|HTML|DJVU')  # Matched anywhere, e.g. "Text PDF"
+
+def _first_str(value: Any) -> str:
+    """First value of a field IA returns as either a string or a list of strings"""
+    if isinstance(value, list):
+        value = value[0] if value else ""
+    return value if isinstance(value, str) else ""
+
 class InternetArchiveClient(BaseAPIClient):
     """Internet Archive API client for books and texts"""
     
     def __init__(self):
         super().__init__(base_url="https://archive.org")
-        self.last_request_time = 0
-        self.min_request_interval = 0.5  # Be respectful to Internet Archive
+        # Token bucket: be respectful to Internet Archive, at most 2 requests per second
+        self._limiter = AsyncLimiter(max_rate=2, time_period=1.0)
+        # Caps in-flight requests across concurrent searches so they don't queue in the pool
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
         
         self.client.headers.update({
             "User-Agent": "OpenScholar Research Tool/1.0 (mailto:research@openscholar.app)",
             "Accept": "application/json"
         })
     
-    async def _wait_for_rate_limit(self):
-        """Ensure we don't overwhelm Internet Archive API"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(wait_time)
-        
-        self.last_request_time = time.time()
-    
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
                     education_level: Optional[str] = None,
                     limit: int = 20) -> List[Paper]:
         """Search Internet Archive for texts and books"""
         
-        await self._wait_for_rate_limit()
-        
         # Build query for Internet Archive Advanced Search
-        search_query = f"({query})"
-        
-        # Add media type filter for texts/books
-        search_query += " AND mediatype:(texts OR books)"
-        
-        # Add collection filters for freely accessible content (avoid restricted collections)
-        search_query += " AND (collection:opensource OR collection:gutenberg OR collection:internetarchivebooks)"
-        # Exclude restricted/preview-only collections
-        search_query += " AND NOT collection:inlibrary"
+        search_query = f"({query}){_BASE_FILTERS}"
         
         # Add year filter if specified
         if year_start and year_end:
@@ -63,46 +92,34 @@ class InternetArchiveClient(BaseAPIClient):
         
         # Add discipline-specific terms
         if discipline:
-            discipline_terms = {
-                "education": "education OR educational OR teaching OR learning OR pedagogy OR school",
-                "psychology": "psychology OR psychological OR cognitive OR behavioral OR mental",
-                "computer science": "computer OR programming OR software OR algorithm OR technology",
-                "mathematics": "mathematics OR math OR statistics OR calculus OR algebra OR geometry",
-                "physics": "physics OR quantum OR mechanics OR thermodynamics OR relativity",
-                "biology": "biology OR biological OR life sciences OR ecology OR evolution",
-                "history": "history OR historical OR civilization OR culture",
-                "literature": "literature OR poetry OR novel OR fiction OR writing",
-                "philosophy": "philosophy OR philosophical OR ethics OR logic OR metaphysics"
-            }
-            
-            if discipline.lower() in discipline_terms:
-                search_query += f" AND ({discipline_terms[discipline.lower()]})"
+            search_query += _DISCIPLINE_CLAUSES.get(discipline.lower(), "")
         
         # Build API parameters
         params = {
             "q": search_query,
-            "fl": "identifier,title,creator,description,date,publisher,language,subject,format,downloads,avg_rating,num_reviews",
+            "fl": _SEARCH_FIELDS,
             "rows": min(limit, 50),  # Internet Archive allows up to 10000, but we'll be conservative
             "output": "json",
             "sort": "downloads desc"  # Sort by popularity
         }
         
         try:
-            response = await self.client.get(
-                f"{self.base_url}/advancedsearch.php",
-                params=params,
-                timeout=15.0
-            )
-            response.raise_for_status()
+            # Raw docs are cached so repeat searches skip the request; they are
+            # normalized again each time so callers never share Paper objects
+            cache_key = (search_query, params["rows"])
+            docs = _search_cache.get(cache_key)
+            if docs is None:
+                response = await self._get_with_retry(f"{self.base_url}/advancedsearch.php", params)
+                
+                data = json_loads(response.content)
+                docs = data.get("response", {}).get("docs", [])
+                _search_cache.set(cache_key, docs)
             
-            data = response.json()
             books = []
-            
-            if "response" in data and "docs" in data["response"]:
-                for item in data["response"]["docs"]:
-                    book = await self.normalize_paper(item)
-                    if book:
-                        books.append(book)
+            for item in docs:
+                book = self.normalize_paper(item)
+                if book:
+                    books.append(book)
             
             logger.info(f"Internet Archive returned {len(books)} books for query: {query}")
             return books
@@ -110,8 +127,22 @@ class InternetArchiveClient(BaseAPIClient):
         except Exception as e:
             logger.error(f"Error searching Internet Archive: {e}")
             return []
+
+    async def _get_with_retry(self, url: str, params: Dict[str, Any], attempts: int = 4) -> httpx.Response:
+        """GET under the rate limiter, retrying 429/5xx responses with backoff"""
+        for attempt in range(attempts):
+            async with self._semaphore, self._limiter:
+                response = await self.client.get(url, params=params, timeout=15.0)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == attempts - 1:
+                response.raise_for_status()
+                return response
+
+            delay = retry_delay(response, attempt)
+            logger.warning(f"Internet Archive returned {response.status_code}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
     
-    async def normalize_paper(self, raw_item: Dict[str, Any]) -> Optional[Paper]:
+    def normalize_paper(self, raw_item: Dict[str, Any]) -> Optional[Paper]:
         """Normalize Internet Archive response to Paper model"""
         try:
             # Extract title
@@ -119,9 +150,8 @@ class InternetArchiveClient(BaseAPIClient):
             if not title:
                 return None
             
-            # Clean title (remove extra whitespace and common prefixes)
-            title = re.sub(r'\s+', ' ', title)
-            title = title.strip()
+            # Clean title (collapse runs of whitespace; split() also trims the ends)
+            title = ' '.join(title.split())
             
             # Extract authors/creators
             authors = []
@@ -131,38 +161,26 @@ class InternetArchiveClient(BaseAPIClient):
                     for auth in creator:
                         if auth and auth.strip():
                             # Clean up author names
-                            clean_auth = re.sub(r'\s*\(\d{4}-?\d{0,4}\)', '', auth).strip()
+                            clean_auth = _LIFE_DATES_RE.sub('', auth).strip()
                             authors.append(clean_auth)
                 elif isinstance(creator, str) and creator.strip():
-                    clean_auth = re.sub(r'\s*\(\d{4}-?\d{0,4}\)', '', creator).strip()
+                    clean_auth = _LIFE_DATES_RE.sub('', creator).strip()
                     authors.append(clean_auth)
             
             # Extract description
-            description = raw_item.get("description", "")
-            if isinstance(description, list) and description:
-                description = description[0]
-            
-            abstract = description if description else "No description available"
+            abstract = _first_str(raw_item.get("description")) or "No description available"
             
             # Clean abstract (remove HTML tags and excessive whitespace)
-            abstract = re.sub(r'<[^>]+>', '', abstract)
-            abstract = re.sub(r'\s+', ' ', abstract).strip()
+            abstract = _HTML_TAG_RE.sub('', abstract)
+            abstract = ' '.join(abstract.split())
             
-            # Limit abstract length
+            # Limit abstract length, cutting at the last word boundary
             if len(abstract) > 500:
-                abstract = abstract[:500] + "..."
-            
-            # Extract year
-            year = ""
-            date_field = raw_item.get("date", "")
-            if date_field:
-                if isinstance(date_field, list) and date_field:
-                    date_field = date_field[0]
-                
-                # Extract year from various date formats
-                year_match = re.search(r'\b(19|20)\d{2}\b', str(date_field))
-                if year_match:
-                    year = year_match.group()
+                abstract = abstract[:500].rsplit(' ', 1)[0] + "..."
+            
+            # Extract year from various date formats
+            year_match = _YEAR_RE.search(_first_str(raw_item.get("date")))
+            year = year_match.group() if year_match else ""
             
             # Extract identifier for URL construction
             identifier = raw_item.get("identifier", "")
@@ -172,15 +190,9 @@ class InternetArchiveClient(BaseAPIClient):
             # Construct URLs
             full_text_url = f"https://archive.org/details/{identifier}"
             
-            # Extract publisher
-            publisher = raw_item.get("publisher", "")
-            if isinstance(publisher, list) and publisher:
-                publisher = publisher[0]
-            
-            # Extract language
-            language = raw_item.get("language", "en")
-            if isinstance(language, list) and language:
-                language = language[0]
+            # Extract publisher and language
+            publisher = _first_str(raw_item.get("publisher"))
+            language = _first_str(raw_item.get("language", "en"))
             
             # Extract subjects
             subjects = []
@@ -193,28 +205,19 @@ class InternetArchiveClient(BaseAPIClient):
             
             # Extract formats and validate full access
             formats = raw_item.get("format", [])
-            download_formats = []
+            if isinstance(formats, str):
+                formats = [formats]
             
-            # Check if item has downloadable text formats (indicating full access)
-            has_full_text = False
-            
-            if formats:
-                if isinstance(formats, list):
-                    for fmt in formats:
-                        fmt_upper = fmt.upper()
-                        # Check for full-text readable formats
-                        if any(x in fmt_upper for x in ["PDF", "EPUB", "MOBI", "TXT", "HTML", "DJVU"]):
-                            has_full_text = True
-                            if fmt_upper not in download_formats:
-                                download_formats.append(fmt_upper)
-                elif isinstance(formats, str):
-                    fmt_upper = formats.upper()
-                    if any(x in fmt_upper for x in ["PDF", "EPUB", "MOBI", "TXT", "HTML", "DJVU"]):
-                        has_full_text = True
+            # Keep the downloadable text formats (indicating full access)
+            download_formats = []
+            if isinstance(formats, list):
+                for fmt in formats:
+                    fmt_upper = fmt.upper()
+                    if _FULL_TEXT_FORMAT_RE.search(fmt_upper) and fmt_upper not in download_formats:
                         download_formats.append(fmt_upper)
             
             # Only return items with full text access
-            if not has_full_text:
+            if not download_formats:
                 return None
             
             # Extract download count and rating as popularity indicators
@@ -227,7 +230,8 @@ class InternetArchiveClient(BaseAPIClient):
             if avg_rating and num_reviews:
                 popularity_score += int(float(avg_rating) * int(num_reviews))
             
-            return Paper(
+            # Values were unwrapped and type-checked above, so skip validation
+            return Paper.model_construct(
                 title=title,
                 authors=authors if authors else ["Unknown"],
                 abstract=abstract,
@@ -7,12 +7,56 @@ Fetches actual books from LibreTexts libraries
 import logging
 from typing import List, Dict, Any, Optional
 import httpx
+from app.api_clients.base import get_shared_transport
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
-from bs4 import BeautifulSoup
+from app.api_clients.libretexts_new import LibreTextsClient as LibreTextsAPIClient
+from app.api_clients.libretexts_pages import MAX_CONCURRENT_REQUESTS, cached_get, category_books, parse_html, listing_books, main_content, text_of, BOOKSHELF_LINKS
 import asyncio
+import re
+from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+# Non-empty search results by (query, max_results), for repeated identical searches
+RESULTS_CACHE_TTL = 600
+_results_cache = TTLCache(maxsize=512, ttl=RESULTS_CACHE_TTL)
+
+# Shared metadata of every LibreTexts book; copied into each Paper
+_LIBRE_AUTHORS = ('LibreTexts Contributors',)
+_LIBRE_FORMATS = ('HTML', 'PDF', 'EPUB')
+
+# Absolute links one level below a library's Bookshelves, e.g.
+# https://math.libretexts.org/Bookshelves/Calculus
+_CATEGORY_HREF_RE = re.compile(r'https?://[^/]+/Bookshelves/[^/]+$')
+
+def _make_libretexts_paper(title: str, url: str, discipline: str, category: Optional[str] = None) -> Paper:
+    """Build the Paper for a LibreTexts book, found directly on a bookshelf or within a category"""
+    library = discipline.title()
+    found_in = f"{library} library" if category is None else f"{library} library - {category}"
+    
+    # Titles and URLs come straight from the listing markup, so skip validation
+    return Paper.model_construct(
+        title=title,
+        authors=list(_LIBRE_AUTHORS),
+        abstract=f"Open textbook from LibreTexts {found_in}. Part of the LibreTexts project providing free, peer-reviewed instructional materials.",
+        year='2024',
+        source="LibreTexts",
+        full_text_url=url,
+        journal=f"LibreTexts {library}",
+        content_type='book',
+        subjects=[library, 'Open Textbook'],
+        download_formats=list(_LIBRE_FORMATS)
+    )
+
+def _extract_book(title: str, href: str, base_url: str, query_folded: str, discipline: str,
+                  category: Optional[str] = None) -> Optional[Paper]:
+    """Paper for a listing entry that is an individual book matching the query, else None"""
+    # Books have author names in parentheses; categories don't
+    if not (href and title and '(' in title and ')' in title and query_folded in title.casefold()):
+        return None
+    return _make_libretexts_paper(title, urljoin(base_url + '/', href), discipline, category)
+
 class LibreTextsClient:
     """Enhanced client for fetching LibreTexts books"""
     
@@ -33,18 +77,45 @@ class LibreTextsClient:
     
     def __init__(self):
         self.timeout = httpx.Timeout(30.0)
+        # The shared pool speaks HTTP/2, so a library's concurrent category
+        # requests are multiplexed over one connection that outlives the search
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            transport=get_shared_transport(),
+            headers={"User-Agent": "OpenScholar/1.0"}
+        )
+        # Bounds the fan-out of a search, not just the connections it uses
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._api = LibreTextsAPIClient()
         
     async def search(self, query: str, max_results: int = 20) -> List[Paper]:
+        """Cached search; repeat queries within RESULTS_CACHE_TTL skip the requests"""
+        cache_key = (query, max_results)
+        papers = _results_cache.get(cache_key)
+        if papers is None:
+            papers = tuple(await self._search(query, max_results))
+            if papers:
+                _results_cache.set(cache_key, papers)
+        
+        # Copies, so callers never share Paper objects with the cache
+        return [paper.model_copy() for paper in papers]
+    
+    async def _search(self, query: str, max_results: int) -> List[Paper]:
         """Search for textbooks across LibreTexts libraries"""
-        papers = []
-        query_lower = query.lower()
+        # The JSON search API answers in one request; the bookshelves are only
+        # scraped when it has nothing
+        papers = await self._api.search(query, max_results)
+        if papers:
+            return papers
+        
+        query_folded = query.casefold()
         
         # Determine which libraries to search based on query
         libraries_to_search = []
         
         # Check for specific disciplines
         for discipline, url in self.LIBRARIES.items():
-            if query_lower in discipline or discipline in query_lower:
+            if query_folded in discipline or discipline in query_folded:
                 libraries_to_search.append((discipline, url))
         
         # If no specific match, search multiple libraries
@@ -57,136 +128,90 @@ class LibreTextsClient:
                 ('physics', self.LIBRARIES['physics'])
             ]
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            # Fetch bookshelves from each library
-            for discipline, base_url in libraries_to_search:
+        # Libraries are independent, so fetch them concurrently
+        client = self.client
+        tasks = [
+            asyncio.ensure_future(self._fetch_library(client, discipline, base_url, query_folded, max_results))
+            for discipline, base_url in libraries_to_search
+        ]
+        
+        # Combine in library order, as a serial search would have filled them;
+        # the libraries left once it is full would only be discarded, so stop them
+        try:
+            for (discipline, _), task in zip(libraries_to_search, tasks):
                 if len(papers) >= max_results:
                     break
-                    
                 try:
-                    # Get the bookshelf page
-                    bookshelf_url = f"{base_url}/Bookshelves"
-                    response = await client.get(bookshelf_url)
-                    
-                    if response.status_code == 200:
-                        soup = BeautifulSoup(response.text, 'html.parser')
-                        
-                        # First check if there are any books directly on the bookshelf page
-                        direct_books = soup.find_all('li', class_='mt-sortable-listing')
-                        for book_item in direct_books:
-                            if len(papers) >= max_results:
-                                break
-                            
-                            book_link = book_item.find('a', class_='mt-sortable-listing-link')
-                            if not book_link:
-                                continue
-                                
-                            book_href = book_link.get('href', '')
-                            book_title_span = book_link.find('span', class_='mt-sortable-listing-title')
-                            book_title = book_title_span.get_text(strip=True) if book_title_span else book_link.get('title', '').split(':')[0]
-                            
-                            # Check if this book matches the query and is not a category page
-                            # Books have author names in parentheses
-                            is_individual_book = '(' in book_title and ')' in book_title
-                            
-                            if (book_href and book_title and query_lower in book_title.lower() and is_individual_book):
-                                # Build full URL
-                                if not book_href.startswith('http'):
-                                    full_book_url = base_url + book_href if book_href.startswith('/') else base_url + '/' + book_href
-                                else:
-                                    full_book_url = book_href
-                                
-                                paper = Paper(
-                                    title=book_title,
-                                    authors=['LibreTexts Contributors'],
-                                    abstract=f"Open textbook from LibreTexts {discipline.title()} library. Part of the LibreTexts project providing free, peer-reviewed instructional materials.",
-                                    year='2024',
-                                    source="LibreTexts",
-                                    full_text_url=full_book_url,
-                                    journal=f"LibreTexts {discipline.title()}",
-                                    content_type='book',
-                                    subjects=[discipline.title(), 'Open Textbook'],
-                                    download_formats=['HTML', 'PDF', 'EPUB'],
-                                    license='CC BY-NC-SA 4.0'
-                                )
-                                papers.append(paper)
-                        
-                        # Then find all category pages to search within
-                        category_links = soup.find_all('a', href=True)
-                        all_categories = []
-                        
-                        for link in category_links:
-                            href = link.get('href', '')
-                            title = link.get_text(strip=True)
-                            
-                            # Collect all category pages in Bookshelves
-                            if '/Bookshelves/' in href and href.count('/') == base_url.count('/') + 2:
-                                if not href.startswith('http'):
-                                    full_url = base_url + href if href.startswith('/') else base_url + '/' + href
-                                else:
-                                    full_url = href
-                                all_categories.append((title, full_url))
-                        
-                        # Second pass: drill down into each category to find books matching the query
-                        for category_title, category_url in all_categories:  # Search all categories
-                            if len(papers) >= max_results:
-                                break
-                                
-                            try:
-                                category_response = await client.get(category_url)
-                                if category_response.status_code == 200:
-                                    category_soup = BeautifulSoup(category_response.text, 'html.parser')
-                                    
-                                    # Look for mt-sortable-listing items which are actual books
-                                    book_listings = category_soup.find_all('li', class_='mt-sortable-listing')
-                                    
-                                    for book_item in book_listings:
-                                        if len(papers) >= max_results:
-                                            break
-                                            
-                                        book_link = book_item.find('a', class_='mt-sortable-listing-link')
-                                        if not book_link:
-                                            continue
-                                            
-                                        book_href = book_link.get('href', '')
-                                        book_title_span = book_link.find('span', class_='mt-sortable-listing-title')
-                                        book_title = book_title_span.get_text(strip=True) if book_title_span else book_link.get('title', '').split(':')[0]
-                                        
-                                        # Filter for actual individual books that match query
-                                        # Books have author names in parentheses
-                                        is_individual_book = '(' in book_title and ')' in book_title
-                                        
-                                        if (book_href and book_title and 
-                                            query_lower in book_title.lower() and is_individual_book):
-                                            
-                                            # Build full URL
-                                            if not book_href.startswith('http'):
-                                                full_book_url = base_url + book_href if book_href.startswith('/') else base_url + '/' + book_href
-                                            else:
-                                                full_book_url = book_href
-                                            
-                                            paper = Paper(
-                                                title=book_title,
-                                                authors=['LibreTexts Contributors'],
-                                                abstract=f"Open textbook from LibreTexts {discipline.title()} library - {category_title}. Part of the LibreTexts project providing free, peer-reviewed instructional materials.",
-                                                year='2024',
-                                                source="LibreTexts",
-                                                full_text_url=full_book_url,
-                                                journal=f"LibreTexts {discipline.title()}",
-                                                content_type='book',
-                                                subjects=[discipline.title(), 'Open Textbook'],
-                                                download_formats=['HTML', 'PDF', 'EPUB'],
-                                                license='CC BY-NC-SA 4.0'
-                                            )
-                                            papers.append(paper)
-                                            
-                            except Exception as e:
-                                logger.debug(f"Error fetching category {category_url}: {e}")
-                                continue
-                    
+                    result = await task
                 except Exception as e:
                     logger.error(f"Error searching LibreTexts {discipline}: {str(e)}")
                     continue
+                papers.extend(result[:max_results - len(papers)])
+        finally:
+            for task in tasks:
+                task.cancel()
         
         logger.info(f"LibreTexts: Found {len(papers)} results for '{query}'")
-        return papers
\ No newline at end of file
+        return papers
+    
+    async def _fetch_library(self, client: httpx.AsyncClient, discipline: str, base_url: str,
+                             query_folded: str, max_results: int) -> List[Paper]:
+        """Collect up to max_results matching books from one library's bookshelves"""
+        papers = []
+        
+        try:
+            # Get the bookshelf page
+            bookshelf_url = f"{base_url}/Bookshelves"
+            response = await cached_get(client, bookshelf_url, self._semaphore)
+            
+            if response.status_code == 200:
+                tree = parse_html(response)
+                
+                # First check if there are any books directly on the bookshelf page
+                for book_title, book_href in listing_books(tree):
+                    paper = _extract_book(book_title, book_href, base_url, query_folded, discipline)
+                    if paper:
+                        papers.append(paper)
+                        if len(papers) >= max_results:
+                            break
+                
+                if len(papers) >= max_results:
+                    return papers
+                
+                # Then find all category pages to search within
+                all_categories = []
+                
+                # Only the content area; the navigation links the same bookshelves on every page
+                for link in BOOKSHELF_LINKS(main_content(tree)):
+                    href = link.get('href', '')
+                    
+                    # Collect all category pages in Bookshelves
+                    if _CATEGORY_HREF_RE.match(href):
+                        all_categories.append((text_of(link), urljoin(base_url + '/', href)))
+                
+                # Second pass: drill down into all categories at once to find books matching the query
+                # Listings are cached per category, so repeat queries only filter them
+                category_listings = await asyncio.gather(
+                    *(category_books(client, category_url, self._semaphore) for _, category_url in all_categories),
+                    return_exceptions=True
+                )
+                
+                for (category_title, category_url), books in zip(all_categories, category_listings):
+                    if len(papers) >= max_results:
+                        break
+                    if isinstance(books, Exception):
+                        logger.debug(f"Error fetching category {category_url}: {books}")
+                        continue
+                    
+                    # Look for mt-sortable-listing items which are actual books
+                    for book_title, book_href in books:
+                        paper = _extract_book(book_title, book_href, base_url, query_folded, discipline, category_title)
+                        if paper:
+                            papers.append(paper)
+                            if len(papers) >= max_results:
+                                break
+            
+        except Exception as e:
+            logger.error(f"Error searching LibreTexts {discipline}: {str(e)}")
+        
+        return papers
@@ -6,16 +6,79 @@ Properly searches across all 3000+ LibreTexts books
 import logging
 from typing import List, Dict, Any, Optional
 import httpx
+from app.api_clients.base import get_shared_transport
 from app.models import Paper
-from bs4 import BeautifulSoup
+from app.api_clients.libretexts_pages import (
+    MAX_CONCURRENT_REQUESTS, cached_get, category_books, parse_html, first, text_of,
+    BOOKSHELF_LINKS, SEARCH_RESULTS, MW_SEARCH_RESULTS, FIRST_LINK, RESULT_TEXT, RESULT_MATCH,
+)
 import asyncio
 import re
+from urllib.parse import urljoin
 
 logger = logging.getLogger(__name__)
 
+# Keywords to library mapping
+_KEYWORD_LIBRARIES = {
+    'math': ['mathematics', 'statistics'],
+    'calculus': ['mathematics'],
+    'algebra': ['mathematics'],
+    'statistics': ['statistics', 'mathematics'],
+    'biology': ['biology', 'medicine'],
+    'chemistry': ['chemistry'],
+    'physics': ['physics'],
+    'engineering': ['engineering'],
+    'computer': ['engineering', 'mathematics'],
+    'psychology': ['social_sciences'],
+    'sociology': ['social_sciences'],
+    'history': ['humanities', 'social_sciences'],
+    'literature': ['humanities'],
+    'business': ['business'],
+    'economics': ['business', 'social_sciences'],
+    'medicine': ['medicine', 'biology'],
+    'spanish': ['español', 'spanish'],
+    'science': ['biology', 'chemistry', 'physics', 'geosciences']
+}
+# Matches every keyword occurring anywhere in the query; the lookahead lets matches overlap
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(map(re.escape, _KEYWORD_LIBRARIES)) + '))')
+_DEFAULT_LIBRARIES = ('mathematics', 'biology', 'chemistry', 'physics', 'humanities', 'social_sciences')
+
+# Shared metadata of every LibreTexts book; copied into each Paper
+_LIBRE_AUTHORS = ('LibreTexts Contributors',)
+_LIBRE_FORMATS = ('PDF', 'Online')
+
+def _make_libretexts_paper(title: str, url: str, discipline: str, abstract: str) -> Paper:
+    """Build the Paper for a LibreTexts book or search hit, linking to its landing page"""
+    library = discipline.title()
+    
+    # Values come straight from the page markup, so skip validation
+    return Paper.model_construct(
+        title=title,
+        authors=list(_LIBRE_AUTHORS),
+        abstract=abstract,
+        year='2024',
+        source='LibreTexts',
+        full_text_url=url,
+        content_type='book',
+        subjects=[library],
+        download_formats=list(_LIBRE_FORMATS),
+        publisher=f'LibreTexts {library}'
+    )
+
 class LibreTextsEnhanced:
     """Enhanced client that actually searches LibreTexts content"""
     
+    def __init__(self):
+        # The shared pool speaks HTTP/2, so the concurrent library and category
+        # requests are multiplexed per host over connections that outlive the search
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            transport=get_shared_transport(),
+            headers={"User-Agent": "OpenScholar/1.0"}
+        )
+        # Bounds the fan-out of a search, not just the connections it uses
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    
     async def _get_pdf_url(self, page_url: str) -> str:
         """Convert LibreTexts page URL to PDF download URL"""
         # LibreTexts PDF URLs follow a pattern:
@@ -50,74 +113,51 @@ class LibreTextsEnhanced:
     async def search(self, query: str, max_results: int = 100) -> List[Paper]:
         """Search across all LibreTexts libraries"""
         papers = []
-        query_lower = query.lower()
-        
         # Determine which libraries to search
-        libraries_to_search = self._select_libraries(query_lower)
+        libraries_to_search = self._select_libraries(query.casefold())
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            # Search each library
-            tasks = []
-            for discipline, base_url in libraries_to_search:
-                if len(papers) < max_results:
-                    task = self._search_library(client, discipline, base_url, query, max_results - len(papers))
-                    tasks.append(task)
-            
-            # Run searches in parallel
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Combine results
-            for result in results:
-                if isinstance(result, list):
-                    papers.extend(result)
-                    if len(papers) >= max_results:
-                        papers = papers[:max_results]
-                        break
-                elif isinstance(result, Exception):
-                    logger.warning(f"Search error: {result}")
+        client = self.client
+        # Run searches in parallel
+        tasks = [
+            asyncio.ensure_future(self._search_library(client, discipline, base_url, query, max_results))
+            for discipline, base_url in libraries_to_search
+        ]
+        
+        # Combine results as each library finishes, so a slow library only holds
+        # the search up while it is still needed; once full, stop the rest
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    result = await next_done
+                except Exception as e:
+                    logger.warning(f"Search error: {e}")
+                    continue
+                papers.extend(result)
+                if len(papers) >= max_results:
+                    papers = papers[:max_results]
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
         
         logger.info(f"LibreTexts returned {len(papers)} books for query: {query}")
         return papers
     
     def _select_libraries(self, query_lower: str) -> List[tuple]:
         """Select which libraries to search based on query"""
-        # Keywords to library mapping
-        keyword_map = {
-            'math': ['mathematics', 'statistics'],
-            'calculus': ['mathematics'],
-            'algebra': ['mathematics'],
-            'statistics': ['statistics', 'mathematics'],
-            'biology': ['biology', 'medicine'],
-            'chemistry': ['chemistry'],
-            'physics': ['physics'],
-            'engineering': ['engineering'],
-            'computer': ['engineering', 'mathematics'],
-            'psychology': ['social_sciences'],
-            'sociology': ['social_sciences'],
-            'history': ['humanities', 'social_sciences'],
-            'literature': ['humanities'],
-            'business': ['business'],
-            'economics': ['business', 'social_sciences'],
-            'medicine': ['medicine', 'biology'],
-            'spanish': ['español', 'spanish'],
-            'science': ['biology', 'chemistry', 'physics', 'geosciences']
-        }
+        selected = {}
         
-        selected = set()
-        
-        # Check for keyword matches
-        for keyword, libraries in keyword_map.items():
-            if keyword in query_lower:
-                for lib in libraries:
-                    if lib in self.LIBRARIES:
-                        selected.add((lib, self.LIBRARIES[lib]))
+        # Check for keyword matches, all found in a single scan of the query
+        for keyword in _KEYWORD_RE.findall(query_lower):
+            for lib in _KEYWORD_LIBRARIES[keyword]:
+                if lib in self.LIBRARIES:
+                    selected[(lib, self.LIBRARIES[lib])] = None
         
         # If no matches, search core STEM libraries
         if not selected:
-            default_libs = ['mathematics', 'biology', 'chemistry', 'physics', 'humanities', 'social_sciences']
-            for lib in default_libs:
+            for lib in _DEFAULT_LIBRARIES:
                 if lib in self.LIBRARIES:
-                    selected.add((lib, self.LIBRARIES[lib]))
+                    selected[(lib, self.LIBRARIES[lib])] = None
         
         return list(selected)[:6]  # Limit to 6 libraries to avoid too many requests
     
@@ -134,10 +174,11 @@ class LibreTextsEnhanced:
                 'fulltext': 'Search'
             }
             
-            response = await client.get(search_url, params=params)
+            async with self._semaphore:
+                response = await client.get(search_url, params=params)
             
             if response.status_code == 200:
-                papers.extend(await self._parse_search_results(response.text, discipline, base_url, max_results))
+                papers.extend(await self._parse_search_results(client, response, discipline, base_url, max_results))
             
             # If few results, also check the Bookshelves
             if len(papers) < max_results // 2:
@@ -149,104 +190,62 @@ class LibreTextsEnhanced:
         
         return papers
     
-    async def _parse_search_results(self, html: str, discipline: str, base_url: str, max_results: int) -> List[Paper]:
-        """Parse search results page"""
+    async def _parse_search_results(self, client: httpx.AsyncClient, response: httpx.Response, discipline: str,
+                                    base_url: str, max_results: int) -> List[Paper]:
+        """Parse search results page, drilling into category hits with the caller's client"""
         papers = []
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = parse_html(response)
         
-        # We'll use the client passed from the calling method
-        async with httpx.AsyncClient(timeout=httpx.Timeout(30.0)) as client:
-            # Find search results
-            results = soup.find_all('div', class_='searchresult')
-            if not results:
-                results = soup.find_all('li', class_='mw-search-result')
+        # Find search results
+        results = SEARCH_RESULTS(tree)
+        if not results:
+            results = MW_SEARCH_RESULTS(tree)
         
-            for result in results[:max_results]:
-                try:
-                    # Extract title and URL
-                    title_elem = result.find('a')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    href = title_elem.get('href', '')
-                    
-                    # Build full URL first
-                    if href.startswith('/'):
-                        full_url = base_url + href
-                    else:
-                        full_url = href
-                    
-                    # If this is a category page, we need to drill into it
-                    if '/Bookshelves/' in full_url and not ('(' in title and ')' in title):
-                        # This is a category - fetch it and extract books
-                        try:
-                            category_response = await client.get(full_url)
-                            if category_response.status_code == 200:
-                                category_soup = BeautifulSoup(category_response.text, 'html.parser')
-                                
-                                # Extract all books from this category
-                                book_items = category_soup.find_all('li', class_='mt-sortable-listing')
-                                for book_item in book_items:
-                                    book_link = book_item.find('a', class_='mt-sortable-listing-link')
-                                    if book_link:
-                                        book_title = book_link.find('span', class_='mt-sortable-listing-title')
-                                        book_title_text = book_title.get_text(strip=True) if book_title else book_link.get('title', '').split(':')[0]
-                                        
-                                        # Only add if it's a book (has parentheses)
-                                        if '(' in book_title_text and ')' in book_title_text:
-                                            book_href = book_link.get('href', '')
-                                            if not book_href.startswith('http'):
-                                                book_url = base_url + book_href if book_href.startswith('/') else base_url + '/' + book_href
-                                            else:
-                                                book_url = book_href
-                                                
-                                            # Create paper for this book
-                                            paper = Paper(
-                                                title=book_title_text,
-                                                authors=['LibreTexts Contributors'],
-                                                abstract=description[:500] if 'description' in locals() else f"Open textbook from LibreTexts {discipline} library",
-                                                year='2024',
-                                                source='LibreTexts',
-                                                full_text_url=book_url,
-                                                content_type='book',
-                                                subjects=[discipline.title()],
-                                                download_formats=['PDF', 'Online'],
-                                                publisher=f'LibreTexts {discipline.title()}'
-                                            )
-                                            papers.append(paper)
-                        except Exception as e:
-                            logger.debug(f"Error drilling into category: {e}")
-                        
-                        # Skip to next result - we've handled this category
-                        continue
-                    
-                    # Extract snippet/description
-                    snippet_elem = result.find('div', class_='searchresulttext')
-                    if not snippet_elem:
-                        snippet_elem = result.find('span', class_='searchmatch')
-                    
-                    description = snippet_elem.get_text(strip=True) if snippet_elem else f"LibreTexts {discipline} textbook"
-                    
-                    # Create paper with landing page URL
-                    paper = Paper(
-                        title=title,
-                        authors=['LibreTexts Contributors'],
-                        abstract=description[:500],
-                        year='2024',
-                        source='LibreTexts',
-                        full_text_url=full_url,  # Landing page URL
-                        content_type='book',
-                        subjects=[discipline.title()],
-                        download_formats=['PDF', 'Online'],
-                        publisher=f'LibreTexts {discipline.title()}'
-                    )
-                    
-                    papers.append(paper)
+        for result in results[:max_results]:
+            try:
+                # Extract title and URL
+                title_elem = first(FIRST_LINK, result)
+                if title_elem is None:
+                    continue
+                
+                title = text_of(title_elem)
+                href = title_elem.get('href', '')
+                
+                # Build full URL first
+                full_url = urljoin(base_url + '/', href)
+                
+                # If this is a category page, we need to drill into it
+                if '/Bookshelves/' in full_url and not ('(' in title and ')' in title):
+                    # This is a category - fetch it and extract books
+                    try:
+                        # Extract all books from this category
+                        for book_title_text, book_href in await category_books(client, full_url, self._semaphore):
+                            # Only add if it's a book (has parentheses)
+                            if '(' in book_title_text and ')' in book_title_text:
+                                book_url = urljoin(base_url + '/', book_href)
+                                    
+                                # Create paper for this book
+                                abstract = description[:500] if 'description' in locals() else f"Open textbook from LibreTexts {discipline} library"
+                                papers.append(_make_libretexts_paper(book_title_text, book_url, discipline, abstract))
+                    except Exception as e:
+                        logger.debug(f"Error drilling into category: {e}")
                     
-                except Exception as e:
-                    logger.debug(f"Error parsing search result: {e}")
+                    # Skip to next result - we've handled this category
                     continue
+                
+                # Extract snippet/description
+                snippet_elem = first(RESULT_TEXT, result)
+                if snippet_elem is None:
+                    snippet_elem = first(RESULT_MATCH, result)
+                
+                description = text_of(snippet_elem) if snippet_elem is not None else f"LibreTexts {discipline} textbook"
+                
+                # Create paper with landing page URL
+                papers.append(_make_libretexts_paper(title, full_url, discipline, description[:500]))
+                
+            except Exception as e:
+                logger.debug(f"Error parsing search result: {e}")
+                continue
         
         return papers
     
@@ -254,25 +253,25 @@ class LibreTextsEnhanced:
                                  base_url: str, query: str, max_results: int) -> List[Paper]:
         """Browse the Bookshelves section for books"""
         papers = []
-        query_lower = query.lower()
+        # Casefolded and split once, rather than for every link
+        query_words = [word for word in query.casefold().split() if len(word) > 2]
         
         try:
             bookshelf_url = f"{base_url}/Bookshelves"
-            response = await client.get(bookshelf_url)
+            response = await cached_get(client, bookshelf_url, self._semaphore)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
                 # Find all book links
-                book_links = soup.find_all('a', href=lambda h: h and '/Bookshelves/' in h)
+                book_links = BOOKSHELF_LINKS(parse_html(response))
                 
                 for link in book_links[:max_results * 2]:  # Check more links since we'll filter
                     try:
-                        title = link.get_text(strip=True)
+                        title = text_of(link)
                         href = link.get('href', '')
+                        title_folded = title.casefold()
                         
                         # Skip navigation links
-                        if len(title) < 5 or title.lower() in ['bookshelves', 'home', 'back']:
+                        if len(title) < 5 or title_folded in ('bookshelves', 'home', 'back'):
                             continue
                         
                         # Check if this is an individual book (has author in parentheses) vs a category
@@ -282,32 +281,16 @@ class LibreTextsEnhanced:
                         if not is_book:
                             continue
                         
-                        # Check if relevant to query (more flexible matching)
-                        title_lower = title.lower()
-                        query_words = query_lower.split()
-                        
-                        # Match if any query word is in title
-                        if any(word in title_lower for word in query_words if len(word) > 2):
+                        # Check if relevant to query (more flexible matching):
+                        # match if any query word is in title
+                        if any(word in title_folded for word in query_words):
                             # Build full URL
-                            if not href.startswith('http'):
-                                full_url = base_url + href if href.startswith('/') else base_url + '/' + href
-                            else:
-                                full_url = href
-                            
-                            paper = Paper(
-                                title=title,
-                                authors=['LibreTexts Contributors'],
-                                abstract=f"Open textbook from LibreTexts {discipline.title()} library. Free, peer-reviewed instructional material.",
-                                year='2024',
-                                source='LibreTexts',
-                                full_text_url=full_url,  # Landing page URL
-                                content_type='book',
-                                subjects=[discipline.title()],
-                                download_formats=['PDF', 'Online'],
-                                publisher=f'LibreTexts {discipline.title()}'
-                            )
+                            full_url = urljoin(base_url + '/', href)
                             
-                            papers.append(paper)
+                            papers.append(_make_libretexts_paper(
+                                title, full_url, discipline,
+                                f"Open textbook from LibreTexts {discipline.title()} library. Free, peer-reviewed instructional material."
+                            ))
                             
                             if len(papers) >= max_results:
                                 break
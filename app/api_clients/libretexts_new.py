@@ -1,52 +1,56 @@
-# app/api_clients/libretexts.py
+# app/api_clients/libretexts_new.py
 from typing import List
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
 from .http import fetch_json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Raw API results by (query, limit)
+SEARCH_CACHE_TTL = 3600
+_search_cache = TTLCache(maxsize=512, ttl=SEARCH_CACHE_TTL)
+
+def _item_to_paper(item: dict) -> Paper:
+    """Build the Paper for one API result"""
+    # LibreTexts lists authors under either key, as a list or a single name
+    if "authors" in item:
+        authors = item["authors"] if isinstance(item["authors"], list) else [item["authors"]]
+    elif "author" in item:
+        authors = [item["author"]]
+    else:
+        authors = None
+    
+    get = item.get
+    return Paper(
+        title=get("title", "Untitled"),
+        authors=authors or ["LibreTexts Contributors"],
+        year=str(item["year"]) if get("year") else "Unknown",
+        abstract=item["description"] if "description" in item else get("summary", ""),
+        full_text_url=item["url"] if "url" in item else get("link", ""),
+        source="LibreTexts",
+        journal="LibreTexts",
+        content_type="book",
+        subjects=item["subjects"] if "subjects" in item else get("tags", [])
+    )
+
 class LibreTextsClient:
     _URL = "https://api.libretexts.org/search"
 
     async def search(self, query: str, max_results: int = 20) -> List[Paper]:
         try:
-            params = {"q": query, "limit": max_results}
-            data = await fetch_json(self._URL, params=params)
+            cache_key = (query, max_results)
+            results = _search_cache.get(cache_key)
+            if results is None:
+                params = {"q": query, "limit": max_results}
+                data = await fetch_json(self._URL, params=params)
+                
+                # The API returns an array of results
+                results = data if isinstance(data, list) else data.get("results", [])
+                _search_cache.set(cache_key, results)
             
-            papers = []
-            # The API returns an array of results
-            results = data if isinstance(data, list) else data.get("results", [])
+            papers = [_item_to_paper(item) for item in results[:max_results]]
             
-            for item in results[:max_results]:
-                # Extract authors - LibreTexts often lists them in various fields
-                authors = []
-                if "authors" in item:
-                    if isinstance(item["authors"], list):
-                        authors = item["authors"]
-                    else:
-                        authors = [item["authors"]]
-                elif "author" in item:
-                    authors = [item["author"]]
-                
-                if not authors:
-                    authors = ["LibreTexts Contributors"]
-                
-                # Build the paper object
-                paper = Paper(
-                    title=item.get("title", "Untitled"),
-                    authors=authors,
-                    year=str(item.get("year", "")) if item.get("year") else None,
-                    abstract=item.get("description", item.get("summary", "")),
-                    full_text_url=item.get("url", item.get("link", "")),
-                    source="LibreTexts",
-                    journal="LibreTexts",
-                    content_type="book",
-                    subjects=item.get("subjects", item.get("tags", [])),
-                    license=item.get("license", "CC BY-NC-SA")
-                )
-                papers.append(paper)
-                
             logger.info(f"LibreTexts: Found {len(papers)} results for '{query}'")
             return papers
             
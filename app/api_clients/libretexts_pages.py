@@ -0,0 +1,134 @@
+"""
+LibreTexts page fetching and parsing
+
+Page cache and precompiled lxml XPath queries shared by the LibreTexts scraping clients
+"""
+
+import asyncio
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import httpx
+from lxml import html as lxmlhtml
+from lxml.etree import XPath
+from app.cache.memory_cache import TTLCache
+
+# Bookshelf pages by URL, and the parsed (title, href) listing of category pages;
+# both change on the order of days
+PAGE_CACHE_TTL = 3600
+_page_cache = TTLCache(maxsize=64, ttl=PAGE_CACHE_TTL)
+_listing_cache = TTLCache(maxsize=1024, ttl=PAGE_CACHE_TTL)
+_inflight: Dict[Tuple[str, str], "asyncio.Future[Any]"] = {}
+
+# In-flight requests per client; a search fans out to ~30 category pages in
+# each of up to 6 libraries, which would otherwise all hit LibreTexts at once
+MAX_CONCURRENT_REQUESTS = 16
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching one whitespace-separated class token, like BeautifulSoup's class_"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# The first listing link of each mt-sortable-listing item, in one query
+# rather than a per-item lookup
+LISTING_LINKS = XPath(
+    f"//li[{_has_class('mt-sortable-listing')}]/descendant::a[{_has_class('mt-sortable-listing-link')}][1]"
+)
+LISTING_TITLE = XPath(f".//span[{_has_class('mt-sortable-listing-title')}]")
+
+# Relative, so they can be run on the page content rather than the whole document
+BOOKSHELF_LINKS = XPath(".//a[contains(@href, '/Bookshelves/')]")
+MAIN_CONTENT = XPath("//main | //*[@id='mt-content']")
+
+SEARCH_RESULTS = XPath(f"//div[{_has_class('searchresult')}]")
+MW_SEARCH_RESULTS = XPath(f"//li[{_has_class('mw-search-result')}]")
+FIRST_LINK = XPath(".//a")
+RESULT_TEXT = XPath(f".//div[{_has_class('searchresulttext')}]")
+RESULT_MATCH = XPath(f".//span[{_has_class('searchmatch')}]")
+
+def _coalesced(key: Tuple[str, str], fetch_fn: Callable[[], Awaitable[Any]]) -> "asyncio.Future[Any]":
+    """Fetch for key, letting concurrent requests for it share a single fetch"""
+    fetch = _inflight.get(key)
+    if fetch is None:
+        fetch = asyncio.ensure_future(fetch_fn())
+        _inflight[key] = fetch
+        fetch.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    # Shielded so one cancelled caller doesn't cancel the fetch for the others
+    return asyncio.shield(fetch)
+
+async def _bounded_get(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> httpx.Response:
+    async with semaphore:
+        return await client.get(url)
+
+async def cached_get(client: httpx.AsyncClient, url: str, semaphore: asyncio.Semaphore) -> httpx.Response:
+    """GET a bookshelf page, serving successful responses from _page_cache"""
+    response = _page_cache.get(url)
+    if response is None:
+        response = await _coalesced(("page", url), lambda: _bounded_get(client, url, semaphore))
+        if response.status_code == 200:
+            _page_cache.set(url, response)
+    return response
+
+async def category_books(client: httpx.AsyncClient, url: str,
+                         semaphore: asyncio.Semaphore) -> Tuple[Tuple[str, str], ...]:
+    """(title, href) listing of a category page, parsed once and kept in _listing_cache
+
+    Returns nothing when the page could not be loaded.
+    """
+    books = _listing_cache.get(url)
+    if books is None:
+        books = await _coalesced(("listing", url), lambda: _fetch_listing(client, url, semaphore))
+    return books
+
+async def _fetch_listing(client: httpx.AsyncClient, url: str,
+                         semaphore: asyncio.Semaphore) -> Tuple[Tuple[str, str], ...]:
+    """Stream a category page into the parser as it arrives, caching its listing
+
+    Only the parsed listing is kept, so the body is never buffered or decoded whole.
+    """
+    async with semaphore, client.stream("GET", url) as response:
+        if response.status_code != 200:
+            return ()
+        # Feed parsers hold per-document state, so each page gets its own
+        parser = lxmlhtml.HTMLParser(encoding=response.encoding or "utf-8")
+        async for chunk in response.aiter_bytes():
+            parser.feed(chunk)
+    books = tuple(listing_books(parser.close()))
+    _listing_cache.set(url, books)
+    return books
+
+@lru_cache(maxsize=8)
+def _parser(encoding: str) -> lxmlhtml.HTMLParser:
+    return lxmlhtml.HTMLParser(encoding=encoding)
+
+def parse_html(response: httpx.Response) -> lxmlhtml.HtmlElement:
+    """Parse the raw response bytes, decoding with the charset httpx settled on
+
+    libxml2 would otherwise assume Latin-1 for pages without a <meta charset>.
+    """
+    return lxmlhtml.document_fromstring(response.content, parser=_parser(response.encoding or "utf-8"))
+
+def first(xpath: XPath, element) -> Optional[lxmlhtml.HtmlElement]:
+    """First match of a relative query, like BeautifulSoup's find"""
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+def text_of(element) -> str:
+    """Concatenated, individually stripped text of an element, like get_text(strip=True)"""
+    return "".join(text.strip() for text in element.itertext())
+
+def main_content(tree):
+    """The page's main content node, leaving out navigation, sidebars and footer
+
+    Falls back to the whole document for pages without one.
+    """
+    content = first(MAIN_CONTENT, tree)
+    return content if content is not None else tree
+
+def listing_books(tree) -> List[Tuple[str, str]]:
+    """(title, href) of every mt-sortable-listing entry on a bookshelf or category page"""
+    books = []
+    for link in LISTING_LINKS(tree):
+        title_span = first(LISTING_TITLE, link)
+        title = text_of(title_span) if title_span is not None else link.get('title', '').split(':')[0]
+        books.append((title, link.get('href', '')))
+    return books
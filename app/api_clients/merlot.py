@@ -8,6 +8,8 @@ website to find open educational resources.
 import logging
 from typing import List, Dict, Any, Optional
 import httpx
+from app.api_clients.base import get_shared_transport
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote
@@ -15,6 +17,10 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Non-empty search results by (query, max_results), for repeated identical searches
+RESULTS_CACHE_TTL = 600
+_results_cache = TTLCache(maxsize=512, ttl=RESULTS_CACHE_TTL)
+
 class MERLOTClient:
     """Client for searching MERLOT via web scraping or API when key is available"""
     
@@ -22,8 +28,23 @@ class MERLOTClient:
         self.base_url = "https://www.merlot.org"
         self.timeout = httpx.Timeout(30.0)
         self.api_key = api_key
+        # Long-lived client on the shared pool, so keep-alive connections
+        # persist across searches instead of being rebuilt for each one
+        self.client = httpx.AsyncClient(timeout=self.timeout, transport=get_shared_transport())
         
     async def search(self, query: str, max_results: int = 50) -> List[Paper]:
+        """Cached search; repeat queries with the same credentials within RESULTS_CACHE_TTL skip the requests"""
+        cache_key = (self.api_key, query, max_results)
+        papers = _results_cache.get(cache_key)
+        if papers is None:
+            papers = tuple(await self._search(query, max_results))
+            if papers:
+                _results_cache.set(cache_key, papers)
+        
+        # Copies, so callers never share Paper objects with the cache
+        return [paper.model_copy() for paper in papers]
+    
+    async def _search(self, query: str, max_results: int) -> List[Paper]:
         """
         Search for open educational resources using MERLOT API or web scraping
         
@@ -42,128 +63,128 @@ class MERLOTClient:
         papers = []
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Use the search materials endpoint
-                search_url = f"{self.base_url}/merlot/searchMaterials.htm"
-                
-                # Search parameters
-                params = {
-                    'keywords': query,
-                    'materialType': 'Open Textbook',  # Focus on textbooks
-                    'hasCreativeCommons': 'true',     # Only CC licensed
-                    'sort.property': 'relevance'
-                }
-                
-                logger.info(f"Searching MERLOT for: {query}")
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (compatible; OpenScholar/1.0)',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
-                }
+            client = self.client
+            # Use the search materials endpoint
+            search_url = f"{self.base_url}/merlot/searchMaterials.htm"
+            
+            # Search parameters
+            params = {
+                'keywords': query,
+                'materialType': 'Open Textbook',  # Focus on textbooks
+                'hasCreativeCommons': 'true',     # Only CC licensed
+                'sort.property': 'relevance'
+            }
+            
+            logger.info(f"Searching MERLOT for: {query}")
+            
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (compatible; OpenScholar/1.0)',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8'
+            }
+            
+            response = await client.get(search_url, params=params, headers=headers, follow_redirects=True)
+            
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding)
                 
-                response = await client.get(search_url, params=params, headers=headers, follow_redirects=True)
+                # Find search results
+                results_section = soup.find('div', id='searchResults')
+                if results_section:
+                    # Find individual result items
+                    result_items = results_section.find_all('div', class_='resultItem')
+                    
+                    for item in result_items[:max_results]:
+                        try:
+                            # Extract title
+                            title_elem = item.find('a', class_='itemTitle')
+                            if not title_elem:
+                                continue
+                            
+                            title = title_elem.get_text(strip=True)
+                            material_url = urljoin(self.base_url, title_elem.get('href', ''))
+                            
+                            # Extract authors
+                            author_elem = item.find('span', class_='author')
+                            authors = []
+                            if author_elem:
+                                author_text = author_elem.get_text(strip=True)
+                                # Clean up author text
+                                author_text = re.sub(r'^(Author:|By:)\s*', '', author_text, flags=re.IGNORECASE)
+                                authors = [a.strip() for a in author_text.split(',') if a.strip()]
+                            
+                            if not authors:
+                                authors = ['MERLOT Contributor']
+                            
+                            # Extract description
+                            desc_elem = item.find('div', class_='description')
+                            if not desc_elem:
+                                desc_elem = item.find('span', class_='description')
+                            
+                            abstract = ""
+                            if desc_elem:
+                                abstract = desc_elem.get_text(strip=True)
+                            
+                            # Extract additional metadata
+                            metadata_elem = item.find('div', class_='metadata')
+                            subjects = []
+                            
+                            if metadata_elem:
+                                # Look for subject/category info
+                                category_elems = metadata_elem.find_all('a', href=re.compile(r'category'))
+                                for cat in category_elems:
+                                    subjects.append(cat.get_text(strip=True))
+                            
+                            # Create paper object
+                            paper = Paper(
+                                title=title,
+                                authors=authors,
+                                abstract=abstract[:500] if abstract else f"Open educational resource from MERLOT: {title}",
+                                year='2024',  # MERLOT materials are continuously updated
+                                source="MERLOT",
+                                full_text_url=material_url,
+                                journal="MERLOT",
+                                content_type='book',
+                                subjects=subjects[:5] if subjects else ['Open Educational Resources'],
+                                download_formats=['PDF', 'HTML']
+                            )
+                            papers.append(paper)
+                            
+                        except Exception as e:
+                            logger.error(f"Error parsing MERLOT result item: {str(e)}")
+                            continue
                 
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                # If no results found in expected structure, try fallback
+                if not papers:
+                    # Look for alternative result structure
+                    links = soup.find_all('a', href=re.compile(r'/merlot/viewMaterial\.htm'))
                     
-                    # Find search results
-                    results_section = soup.find('div', id='searchResults')
-                    if results_section:
-                        # Find individual result items
-                        result_items = results_section.find_all('div', class_='resultItem')
-                        
-                        for item in result_items[:max_results]:
-                            try:
-                                # Extract title
-                                title_elem = item.find('a', class_='itemTitle')
-                                if not title_elem:
-                                    continue
-                                
-                                title = title_elem.get_text(strip=True)
-                                material_url = urljoin(self.base_url, title_elem.get('href', ''))
-                                
-                                # Extract authors
-                                author_elem = item.find('span', class_='author')
-                                authors = []
-                                if author_elem:
-                                    author_text = author_elem.get_text(strip=True)
-                                    # Clean up author text
-                                    author_text = re.sub(r'^(Author:|By:)\s*', '', author_text, flags=re.IGNORECASE)
-                                    authors = [a.strip() for a in author_text.split(',') if a.strip()]
+                    for link in links[:max_results]:
+                        try:
+                            title = link.get_text(strip=True)
+                            if title and len(title) > 5:  # Filter out empty or too short titles
+                                material_url = urljoin(self.base_url, link.get('href', ''))
                                 
-                                if not authors:
-                                    authors = ['MERLOT Contributor']
-                                
-                                # Extract description
-                                desc_elem = item.find('div', class_='description')
-                                if not desc_elem:
-                                    desc_elem = item.find('span', class_='description')
-                                
-                                abstract = ""
-                                if desc_elem:
-                                    abstract = desc_elem.get_text(strip=True)
-                                
-                                # Extract additional metadata
-                                metadata_elem = item.find('div', class_='metadata')
-                                subjects = []
-                                
-                                if metadata_elem:
-                                    # Look for subject/category info
-                                    category_elems = metadata_elem.find_all('a', href=re.compile(r'category'))
-                                    for cat in category_elems:
-                                        subjects.append(cat.get_text(strip=True))
-                                
-                                # Create paper object
                                 paper = Paper(
                                     title=title,
-                                    authors=authors,
-                                    abstract=abstract[:500] if abstract else f"Open educational resource from MERLOT: {title}",
-                                    year='2024',  # MERLOT materials are continuously updated
+                                    authors=['MERLOT Contributor'],
+                                    abstract=f"Open educational resource from MERLOT: {title}",
+                                    year='2024',
                                     source="MERLOT",
                                     full_text_url=material_url,
                                     journal="MERLOT",
                                     content_type='book',
-                                    subjects=subjects[:5] if subjects else ['Open Educational Resources'],
+                                    subjects=['Open Educational Resources'],
                                     download_formats=['PDF', 'HTML']
                                 )
                                 papers.append(paper)
-                                
-                            except Exception as e:
-                                logger.error(f"Error parsing MERLOT result item: {str(e)}")
-                                continue
-                    
-                    # If no results found in expected structure, try fallback
-                    if not papers:
-                        # Look for alternative result structure
-                        links = soup.find_all('a', href=re.compile(r'/merlot/viewMaterial\.htm'))
-                        
-                        for link in links[:max_results]:
-                            try:
-                                title = link.get_text(strip=True)
-                                if title and len(title) > 5:  # Filter out empty or too short titles
-                                    material_url = urljoin(self.base_url, link.get('href', ''))
-                                    
-                                    paper = Paper(
-                                        title=title,
-                                        authors=['MERLOT Contributor'],
-                                        abstract=f"Open educational resource from MERLOT: {title}",
-                                        year='2024',
-                                        source="MERLOT",
-                                        full_text_url=material_url,
-                                        journal="MERLOT",
-                                        content_type='book',
-                                        subjects=['Open Educational Resources'],
-                                        download_formats=['PDF', 'HTML']
-                                    )
-                                    papers.append(paper)
-                            except Exception:
-                                continue
-                    
-                    logger.info(f"Found {len(papers)} materials on MERLOT")
-                    
-                else:
-                    logger.error(f"MERLOT returned status: {response.status_code}")
-                    
+                        except Exception:
+                            continue
+                
+                logger.info(f"Found {len(papers)} materials on MERLOT")
+                
+            else:
+                logger.error(f"MERLOT returned status: {response.status_code}")
+                
         except Exception as e:
             logger.error(f"Error searching MERLOT: {str(e)}")
             
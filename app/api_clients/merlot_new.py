@@ -1,22 +1,25 @@
-# app/api_clients/merlot.py
+# app/api_clients/merlot_new.py
 from typing import List
 from app.models import Paper
 from .http import fetch_json
+from aiolimiter import AsyncLimiter
 import logging
-import asyncio
 
 logger = logging.getLogger(__name__)
 
 class MERLOTClient:
     _URL = "https://www.merlot.org/merlot/materials.json"
 
+    def __init__(self):
+        # Token bucket: MERLOT allows 2 requests per second, so occasional
+        # searches go straight through and only sustained bursts wait
+        self._limiter = AsyncLimiter(max_rate=2, time_period=1.0)
+
     async def search(self, query: str, max_results: int = 20) -> List[Paper]:
         try:
-            # MERLOT requires throttling - 2 req/s
-            await asyncio.sleep(0.5)  # Ensure we don't exceed rate limit
-            
             params = {"simpleQuery": query, "page": 1, "size": max_results}
-            data = await fetch_json(self._URL, params=params)
+            async with self._limiter:
+                data = await fetch_json(self._URL, params=params)
             
             papers = []
             # Parse MERLOT's response structure
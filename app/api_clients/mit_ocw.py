@@ -5,10 +5,13 @@ This client attempts to use Google Custom Search Engine if configured,
 otherwise falls back to web scraping to find relevant courses and materials.
 """
 
+import asyncio
 import logging
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import httpx
+from app.api_clients.base import get_shared_transport
+from app.cache.memory_cache import TTLCache
 from app.models import Paper
 import re
 from bs4 import BeautifulSoup
@@ -16,6 +19,61 @@ from urllib.parse import urljoin, quote
 
 logger = logging.getLogger(__name__)
 
+# Non-empty search results by (query, max_results), for repeated identical searches
+RESULTS_CACHE_TTL = 600
+_results_cache = TTLCache(maxsize=512, ttl=RESULTS_CACHE_TTL)
+
+# Parsed course cards of each department page, by URL; the listings change on the order of days
+DEPARTMENT_CACHE_TTL = 3600
+_department_cache = TTLCache(maxsize=64, ttl=DEPARTMENT_CACHE_TTL)
+
+# They organize courses by department, so we scrape some popular departments
+_DEPARTMENTS = (
+    '/courses/mathematics/',
+    '/courses/physics/',
+    '/courses/electrical-engineering-and-computer-science/',
+    '/courses/biology/',
+    '/courses/chemistry/',
+    '/courses/economics/'
+)
+
+# Common MIT courses that might match various queries, with their title and
+# subject lowercased once for matching
+_FEATURED_COURSES = tuple((course, course['title'].lower(), course['subject'].lower()) for course in (
+    {
+        'title': '18.01 Single Variable Calculus',
+        'url': '/courses/18-01-single-variable-calculus-fall-2005/',
+        'subject': 'Mathematics'
+    },
+    {
+        'title': '6.001 Structure and Interpretation of Computer Programs',
+        'url': '/courses/6-001-structure-and-interpretation-of-computer-programs-spring-2005/',
+        'subject': 'Computer Science'
+    },
+    {
+        'title': '8.01 Physics I: Classical Mechanics',
+        'url': '/courses/8-01-physics-i-classical-mechanics-fall-2003/',
+        'subject': 'Physics'
+    },
+    {
+        'title': '7.012 Introduction to Biology',
+        'url': '/courses/7-012-introduction-to-biology-fall-2004/',
+        'subject': 'Biology'
+    },
+    {
+        'title': '14.01 Principles of Microeconomics',
+        'url': '/courses/14-01-principles-of-microeconomics-fall-2018/',
+        'subject': 'Economics'
+    }
+))
+
+def _course_link(card) -> Optional[str]:
+    """href of a course card, which is either the link itself or a heading inside one"""
+    if card.name == 'a':
+        return card.get('href')
+    parent_a = card.find_parent('a')
+    return parent_a.get('href') if parent_a else None
+
 class MITOpenCourseWareClient:
     """Client for searching MIT OpenCourseWare materials"""
     
@@ -23,10 +81,25 @@ class MITOpenCourseWareClient:
         self.base_url = "https://ocw.mit.edu"
         self.timeout = httpx.Timeout(30.0)
         self.api_key = api_key
+        # Long-lived client on the shared pool, so keep-alive connections
+        # persist across searches instead of being rebuilt for each one
+        self.client = httpx.AsyncClient(timeout=self.timeout, transport=get_shared_transport())
         # CSE ID can come from environment or be configured separately
         self.cse_id = os.getenv('MIT_OCW_CSE_ID') or os.getenv('GOOGLE_CSE_ID')
         
     async def search(self, query: str, max_results: int = 50) -> List[Paper]:
+        """Cached search; repeat queries with the same credentials within RESULTS_CACHE_TTL skip the requests"""
+        cache_key = (self.api_key, self.cse_id, query, max_results)
+        papers = _results_cache.get(cache_key)
+        if papers is None:
+            papers = tuple(await self._search(query, max_results))
+            if papers:
+                _results_cache.set(cache_key, papers)
+        
+        # Copies, so callers never share Paper objects with the cache
+        return [paper.model_copy() for paper in papers]
+    
+    async def _search(self, query: str, max_results: int) -> List[Paper]:
         """
         Search for open course materials using Google CSE if available,
         otherwise by scraping MIT OCW website
@@ -60,131 +133,111 @@ class MITOpenCourseWareClient:
         try:
             # MIT OCW doesn't have a search API, but we can use their course listing
             # Let's try to get courses from their course finder
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Try to search using their course finder page
-                # They organize courses by department, so let's get some popular departments
-                departments = [
-                    '/courses/mathematics/',
-                    '/courses/physics/',
-                    '/courses/electrical-engineering-and-computer-science/',
-                    '/courses/biology/',
-                    '/courses/chemistry/',
-                    '/courses/economics/'
-                ]
+            client = self.client
+            # Departments are independent pages, so fetch them concurrently
+            query_lower = query.lower()
+            results = await asyncio.gather(
+                *(self._scrape_department(client, dept_url, query_lower, max_results) for dept_url in _DEPARTMENTS),
+                return_exceptions=True
+            )
+            
+            # Combine in department order, as the sequential scrape filled them
+            for dept_url, result in zip(_DEPARTMENTS, results):
+                if len(papers) >= max_results:
+                    break
+                if isinstance(result, Exception):
+                    logger.error(f"Error scraping department {dept_url}: {str(result)}")
+                    continue
+                papers.extend(result[:max_results - len(papers)])
+            
+            # If we didn't find enough results, try a more general approach
+            if len(papers) < 5:
+                # Get some featured courses
+                logger.info("Trying to get featured MIT courses")
                 
-                for dept_url in departments:
-                    if len(papers) >= max_results:
-                        break
+                for course, title_lower, subject_lower in _FEATURED_COURSES:
+                    if query_lower in title_lower or query_lower in subject_lower:
+                        paper = Paper(
+                            title=course['title'],
+                            authors=['MIT Faculty'],
+                            abstract=f"MIT OpenCourseWare course: {course['title']}. This course provides free access to lecture notes, assignments, exams, and other educational materials.",
+                            year='2024',
+                            source="MIT OpenCourseWare",
+                            full_text_url=urljoin(self.base_url, course['url']),
+                            journal="MIT OpenCourseWare",
+                            content_type='book',
+                            subjects=[course['subject']],
+                            download_formats=['HTML', 'PDF']
+                        )
+                        papers.append(paper)
                         
-                    try:
-                        full_url = urljoin(self.base_url, dept_url)
-                        response = await client.get(full_url)
-                        
-                        if response.status_code == 200:
-                            soup = BeautifulSoup(response.text, 'html.parser')
-                            
-                            # Find course cards/links
-                            course_cards = soup.find_all('h3', class_='course-title')
-                            if not course_cards:
-                                # Try alternative structure
-                                course_cards = soup.find_all('a', class_='course-link')
-                            
-                            for card in course_cards[:10]:  # Limit per department
-                                if len(papers) >= max_results:
-                                    break
-                                    
-                                # Extract course info
-                                course_title = card.get_text(strip=True)
-                                
-                                # Check if query matches course title
-                                if query.lower() in course_title.lower():
-                                    # Get course link
-                                    course_link = None
-                                    if card.name == 'a':
-                                        course_link = card.get('href')
-                                    else:
-                                        parent_a = card.find_parent('a')
-                                        if parent_a:
-                                            course_link = parent_a.get('href')
-                                    
-                                    if course_link:
-                                        course_url = urljoin(self.base_url, course_link)
-                                        
-                                        # Create paper object
-                                        paper = Paper(
-                                            title=course_title,
-                                            authors=['MIT Faculty'],
-                                            abstract=f"MIT OpenCourseWare course: {course_title}. Free course materials including lecture notes, assignments, and exams.",
-                                            year='2024',  # OCW courses are continuously updated
-                                            source="MIT OpenCourseWare",
-                                            full_text_url=course_url,
-                                            journal="MIT OpenCourseWare",
-                                            content_type='book',
-                                            subjects=[dept_url.split('/')[-2].replace('-', ' ').title()],
-                                            download_formats=['HTML', 'PDF']
-                                        )
-                                        papers.append(paper)
-                                        
-                    except Exception as e:
-                        logger.error(f"Error scraping department {dept_url}: {str(e)}")
-                        continue
+                        if len(papers) >= max_results:
+                            break
+            
+            logger.info(f"Found {len(papers)} MIT OCW courses matching '{query}'")
+            
+        except Exception as e:
+            logger.error(f"Error searching MIT OpenCourseWare: {str(e)}")
+            
+        return papers
+    
+    async def _scrape_department(self, client: httpx.AsyncClient, dept_url: str,
+                                 query_lower: str, max_results: int) -> List[Paper]:
+        """Courses on one department page whose titles match the query"""
+        papers = []
+        
+        try:
+            for course_title, course_link in await self._department_courses(client, dept_url):
+                if len(papers) >= max_results:
+                    break
                 
-                # If we didn't find enough results, try a more general approach
-                if len(papers) < 5:
-                    # Get some featured courses
-                    logger.info("Trying to get featured MIT courses")
+                # Check if query matches course title
+                if query_lower in course_title.lower() and course_link:
+                    course_url = urljoin(self.base_url, course_link)
                     
-                    # Common MIT courses that might match various queries
-                    featured_courses = [
-                        {
-                            'title': '18.01 Single Variable Calculus',
-                            'url': '/courses/18-01-single-variable-calculus-fall-2005/',
-                            'subject': 'Mathematics'
-                        },
-                        {
-                            'title': '6.001 Structure and Interpretation of Computer Programs',
-                            'url': '/courses/6-001-structure-and-interpretation-of-computer-programs-spring-2005/',
-                            'subject': 'Computer Science'
-                        },
-                        {
-                            'title': '8.01 Physics I: Classical Mechanics',
-                            'url': '/courses/8-01-physics-i-classical-mechanics-fall-2003/',
-                            'subject': 'Physics'
-                        },
-                        {
-                            'title': '7.012 Introduction to Biology',
-                            'url': '/courses/7-012-introduction-to-biology-fall-2004/',
-                            'subject': 'Biology'
-                        },
-                        {
-                            'title': '14.01 Principles of Microeconomics',
-                            'url': '/courses/14-01-principles-of-microeconomics-fall-2018/',
-                            'subject': 'Economics'
-                        }
-                    ]
+                    # Create paper object
+                    paper = Paper(
+                        title=course_title,
+                        authors=['MIT Faculty'],
+                        abstract=f"MIT OpenCourseWare course: {course_title}. Free course materials including lecture notes, assignments, and exams.",
+                        year='2024',  # OCW courses are continuously updated
+                        source="MIT OpenCourseWare",
+                        full_text_url=course_url,
+                        journal="MIT OpenCourseWare",
+                        content_type='book',
+                        subjects=[dept_url.split('/')[-2].replace('-', ' ').title()],
+                        download_formats=['HTML', 'PDF']
+                    )
+                    papers.append(paper)
                     
-                    for course in featured_courses:
-                        if query.lower() in course['title'].lower() or query.lower() in course['subject'].lower():
-                            paper = Paper(
-                                title=course['title'],
-                                authors=['MIT Faculty'],
-                                abstract=f"MIT OpenCourseWare course: {course['title']}. This course provides free access to lecture notes, assignments, exams, and other educational materials.",
-                                year='2024',
-                                source="MIT OpenCourseWare",
-                                full_text_url=urljoin(self.base_url, course['url']),
-                                journal="MIT OpenCourseWare",
-                                content_type='book',
-                                subjects=[course['subject']],
-                                download_formats=['HTML', 'PDF']
-                            )
-                            papers.append(paper)
-                            
-                            if len(papers) >= max_results:
-                                break
-                
-                logger.info(f"Found {len(papers)} MIT OCW courses matching '{query}'")
-                
         except Exception as e:
-            logger.error(f"Error searching MIT OpenCourseWare: {str(e)}")
+            logger.error(f"Error scraping department {dept_url}: {str(e)}")
+        
+        return papers
+    
+    async def _department_courses(self, client: httpx.AsyncClient, dept_url: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+        """(title, link) of the first course cards on a department page, parsed once and kept in _department_cache
+        
+        Returns nothing when the page could not be loaded.
+        """
+        full_url = urljoin(self.base_url, dept_url)
+        courses = _department_cache.get(full_url)
+        if courses is None:
+            response = await client.get(full_url)
+            if response.status_code != 200:
+                return ()
+            
+            soup = BeautifulSoup(response.content, 'lxml', from_encoding=response.encoding)
+            
+            # Find course cards/links
+            course_cards = soup.find_all('h3', class_='course-title')
+            if not course_cards:
+                # Try alternative structure
+                course_cards = soup.find_all('a', class_='course-link')
             
-        return papers
\ No newline at end of file
+            courses = tuple(
+                (card.get_text(strip=True), _course_link(card))
+                for card in course_cards[:10]  # Limit per department
+            )
+            _department_cache.set(full_url, courses)
+        return courses
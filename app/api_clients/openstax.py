@@ -1,6 +1,6 @@
 from typing import List, Dict, Any, Optional
 import httpx
-from app.api_clients.base import BaseAPIClient
+from app.api_clients.base import BaseAPIClient, get_shared_transport
 from app.models import Paper
 import logging
 import asyncio
@@ -27,19 +27,21 @@ class OpenStaxClient(BaseAPIClient):
             base_url=self.base_url,
             timeout=30.0,
             follow_redirects=True,
-            headers=self.client.headers
+            headers=self.client.headers,
+            transport=get_shared_transport()
         )
     
     async def _wait_for_rate_limit(self):
         """Rate limiting"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
@@ -1,11 +1,30 @@
 from typing import List, Dict, Any, Optional
 import httpx
 from app.api_clients.base import BaseAPIClient
+from app.api_clients.http import json_loads
 from app.models import Paper
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Extra search terms for supported disciplines and education levels
+DISCIPLINE_MAPPING = {
+    "education": "education OR learning OR pedagogy",
+    "psychology": "psychology OR cognitive OR behavioral",
+    "child development": "child development OR pediatric OR developmental",
+    "early childhood": "early childhood OR infant OR toddler OR preschool"
+}
+
+LEVEL_MAPPING = {
+    "early childhood": "infant OR toddler OR preschool OR early childhood",
+    "k-12": "school age OR adolescent OR K-12 OR elementary OR secondary",
+    "higher ed": "university OR college OR adult learning"
+}
+
+# URL path or query markers of abstract-only pages, matched in one pass
+_ABSTRACT_URL_RE = re.compile(r'[/?&](?:abstract|summary)', re.IGNORECASE)
+
 class PMCClient(BaseAPIClient):
     """PubMed Central Open Access client via Europe PMC"""
     
@@ -44,24 +63,15 @@ class PMCClient(BaseAPIClient):
         
         # Add discipline-specific terms if provided
         if discipline:
-            discipline_mapping = {
-                "education": "education OR learning OR pedagogy",
-                "psychology": "psychology OR cognitive OR behavioral",
-                "child development": "child development OR pediatric OR developmental",
-                "early childhood": "early childhood OR infant OR toddler OR preschool"
-            }
-            if discipline.lower() in discipline_mapping:
-                query_parts.append(f"({discipline_mapping[discipline.lower()]})")
+            discipline_terms = DISCIPLINE_MAPPING.get(discipline.lower())
+            if discipline_terms:
+                query_parts.append(f"({discipline_terms})")
         
         # Add education level terms if provided
         if education_level:
-            level_mapping = {
-                "early childhood": "infant OR toddler OR preschool OR early childhood",
-                "k-12": "school age OR adolescent OR K-12 OR elementary OR secondary",
-                "higher ed": "university OR college OR adult learning"
-            }
-            if education_level.lower() in level_mapping:
-                query_parts.append(f"({level_mapping[education_level.lower()]})")
+            level_terms = LEVEL_MAPPING.get(education_level.lower())
+            if level_terms:
+                query_parts.append(f"({level_terms})")
         
         # Combine query parts with AND
         search_query = " AND ".join(query_parts)
@@ -80,7 +90,7 @@ class PMCClient(BaseAPIClient):
             )
             response.raise_for_status()
             
-            data = response.json()
+            data = json_loads(response.content)
             papers = []
             
             if "resultList" in data and "result" in data["resultList"]:
@@ -117,7 +127,8 @@ class PMCClient(BaseAPIClient):
             # Check license - only allow Creative Commons or explicit open access
             license_info = raw_paper.get("license")
             if license_info:
-                if not (license_info.lower().startswith("cc") or "open access" in license_info.lower()):
+                license_lower = license_info.lower()
+                if not (license_lower.startswith("cc") or "open access" in license_lower):
                     logger.debug(f"Skipping PMC paper due to restrictive license: {license_info}")
                     return None
             # Extract authors
@@ -137,8 +148,9 @@ class PMCClient(BaseAPIClient):
             if not full_text_url and "fullTextUrlList" in raw_paper:
                 url_list = raw_paper["fullTextUrlList"].get("fullTextUrl", [])
                 for url_obj in url_list:
-                    if "pmc" in url_obj.get("url", "").lower():
-                        full_text_url = url_obj.get("url")
+                    url = url_obj.get("url", "")
+                    if "pmc" in url.lower():
+                        full_text_url = url
                         break
                 # If no PMC URL found, use the first available
                 if not full_text_url and url_list:
@@ -162,11 +174,14 @@ class PMCClient(BaseAPIClient):
             if not journal:
                 journal = raw_paper.get("journal", {}).get("title", "")
             
-            return Paper(
+            pub_year = raw_paper.get("pubYear")
+            
+            # Fields come straight from typed Europe PMC JSON, so skip validation
+            return Paper.model_construct(
                 title=raw_paper.get("title", "").strip(),
                 authors=authors,
                 abstract=abstract.strip(),
-                year=str(raw_paper.get("pubYear", "Unknown")) if raw_paper.get("pubYear") else "Unknown",
+                year=str(pub_year) if pub_year else "Unknown",
                 source="PubMed Central",
                 full_text_url=full_text_url,
                 doi=doi,
@@ -179,23 +194,4 @@ class PMCClient(BaseAPIClient):
     
     def _is_abstract_only_url(self, url: str) -> bool:
         """Check if URL appears to be abstract-only rather than full text"""
-        abstract_indicators = [
-            "/abstract",
-            "?abstract", 
-            "&abstract",
-            "/summary",
-            "?summary",
-            "&summary"
-        ]
-        
-        # Check for abstract indicators in URL
-        url_lower = url.lower()
-        for indicator in abstract_indicators:
-            if indicator in url_lower:
-                return True
-        
-        # PMC URLs should have the full article path
-        if "pmc/articles/" in url_lower and not url_lower.endswith("/"):
-            return False
-        
-        return False
\ No newline at end of file
+        return _ABSTRACT_URL_RE.search(url) is not None
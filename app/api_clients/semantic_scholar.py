@@ -23,14 +23,15 @@ class SemanticScholarClient(BaseAPIClient):
     
     async def _wait_for_rate_limit(self):
         """Ensure we don't exceed rate limits"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def search(self, query: str, year_start: Optional[int] = None, 
                     year_end: Optional[int] = None, discipline: Optional[str] = None,
@@ -1,5 +1,4 @@
 from typing import List, Dict, Any, Optional
-import httpx
 from app.api_clients.base import BaseAPIClient
 from app.models import Paper
 import logging
@@ -28,14 +27,15 @@ class UnpaywallClient(BaseAPIClient):
     
     async def _wait_for_rate_limit(self):
         """Rate limiting"""
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last = current_time - self.last_request_time
         
         if time_since_last < self.min_request_interval:
             wait_time = self.min_request_interval - time_since_last
             await asyncio.sleep(wait_time)
+            current_time += wait_time
         
-        self.last_request_time = time.time()
+        self.last_request_time = current_time
     
     async def search(self, query: str, year_start: int, year_end: int,
                     discipline: Optional[str] = None,
@@ -101,18 +101,17 @@ class UnpaywallClient(BaseAPIClient):
             elif year_end:
                 params["filter"] = f"until-pub-date:{year_end}"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    crossref_url, 
-                    params=params,
-                    headers={"User-Agent": "OpenScholar/1.0 (mailto:research@openscholar.app)"},
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                return data.get("message", {}).get("items", [])
-                
+            response = await self.client.get(
+                crossref_url, 
+                params=params,
+                headers={"User-Agent": "OpenScholar/1.0 (mailto:research@openscholar.app)"},
+                timeout=30.0
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            return data.get("message", {}).get("items", [])
+            
         except Exception as e:
             logger.error(f"Error searching Crossref: {e}")
             return []
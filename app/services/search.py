@@ -1,4 +1,5 @@
-from typing import List, Set, Tuple, Dict
+from typing import List, Set, Tuple, Dict, Optional
+from dataclasses import dataclass
 import asyncio
 import logging
 from app.models import Paper, SearchRequest
@@ -11,6 +12,7 @@ from app.api_clients import (
     OpenTextbookLibraryClient, PressbooksClient, LibreTextsClient,
     MERLOTClient, OERCommonsClient, MITOpenCourseWareClient
 )
+from app.api_clients.base import close_shared_transport
 # Import enhanced implementations
 try:
     from app.api_clients.open_textbook_library_scraper import OpenTextbookLibraryScraper
@@ -28,6 +30,64 @@ import re
 
 logger = logging.getLogger(__name__)
 
+# Per-source deadline in seconds for a single search call
+SOURCE_TIMEOUT = 45.0
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """How SearchService queries one source"""
+    client_attr: str  # SearchService attribute holding the client
+    limit: Optional[int] = None  # Result limit; None uses the client's default
+    oer: bool = False  # OER clients take search(query, max_results) only
+
+# All searchable sources, in the order they are queried
+SOURCES: Dict[str, SourceSpec] = {
+    "ERIC": SourceSpec("eric_client", 75),
+    "CORE": SourceSpec("core_client", 75),
+    "DOAJ": SourceSpec("doaj_client", 75),
+    "Europe PMC": SourceSpec("europe_pmc_client", 75),
+    "PubMed Central": SourceSpec("pmc_client", 75),
+    "PubMed": SourceSpec("pubmed_client"),
+    "Semantic Scholar": SourceSpec("semantic_scholar_client"),
+    # OpenAlex (MASSIVE database - 200M+ papers)
+    "OpenAlex": SourceSpec("openalex_client", 75),
+    # arXiv (preprints and STEM papers)
+    "arXiv": SourceSpec("arxiv_client", 75),
+    # Crossref (scholarly metadata)
+    "Crossref": SourceSpec("crossref_client", 75),
+    # Book sources
+    "DOAB": SourceSpec("doab_client", 50),
+    "Project Gutenberg": SourceSpec("project_gutenberg_client", 50),
+    "Internet Archive": SourceSpec("internet_archive_client", 50),
+    "Open Library": SourceSpec("open_library_client", 50),
+    "OpenStax": SourceSpec("openstax_client", 50),
+    "OAPEN": SourceSpec("oapen_client", 50),
+    # HathiTrust - removed, client not working
+    "BHL": SourceSpec("biodiversity_client", 30),
+    "NLM Bookshelf": SourceSpec("nlm_bookshelf_client", 30),
+    # Article sources
+    "PLOS": SourceSpec("plos_client", 75),
+    "BioMed Central": SourceSpec("biomed_central_client", 75),
+    "Unpaywall": SourceSpec("unpaywall_client", 75),
+    # MDPI - removed, client not working
+    "Google Books": SourceSpec("google_books_client", 50),
+    # Google Search (PDF-only search across the web)
+    "Google Search": SourceSpec("google_search_client", 50),
+    # OER sources
+    "Open Textbook Library": SourceSpec("open_textbook_library_client", 50, oer=True),
+    "Pressbooks": SourceSpec("pressbooks_client", 50, oer=True),
+    "LibreTexts": SourceSpec("libretexts_client", 50, oer=True),
+    "MERLOT": SourceSpec("merlot_client", 50, oer=True),
+    "OER Commons": SourceSpec("oer_commons_client", 50, oer=True),
+    "MIT OpenCourseWare": SourceSpec("mit_ocw_client", 50, oer=True),
+    # BASE (Bielefeld Academic Search Engine)
+    "BASE": SourceSpec("base_client", 75),
+}
+
+# Sources searched when the request doesn't select any
+# BASE is excluded - it requires IP whitelisting
+DEFAULT_SOURCES = [name for name in SOURCES if name != "BASE"]
+
 class SearchService:
     """Service to handle multi-source search and deduplication"""
     
@@ -172,382 +232,34 @@ class SearchService:
         tasks = []
         
         # Get list of sources to search (default to all if none specified)
-        sources_to_search = request.sources if request.sources else [
-            "ERIC", "CORE", "DOAJ", "Europe PMC", "PubMed Central", "PubMed", "Semantic Scholar",
-            "OpenAlex", "arXiv", "Crossref", "DOAB", "Project Gutenberg", "Internet Archive", "Open Library", "OpenStax",
-            "OAPEN", "BHL", "NLM Bookshelf", "PLOS", "BioMed Central", "Unpaywall",
-            "Google Books", "Google Search",  # Removed BASE - requires IP whitelisting
-            "Open Textbook Library", "Pressbooks", "LibreTexts", "MERLOT", "OER Commons", "MIT OpenCourseWare"
-        ]
-        
-        # ERIC search
-        if "ERIC" in sources_to_search:
-            tasks.append(self.eric_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("ERIC")
-        
-        # CORE search
-        if "CORE" in sources_to_search:
-            tasks.append(self.core_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("CORE")
-        
-        # DOAJ search
-        if "DOAJ" in sources_to_search:
-            tasks.append(self.doaj_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("DOAJ")
-        
-        # Europe PMC search
-        if "Europe PMC" in sources_to_search:
-            tasks.append(self.europe_pmc_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("Europe PMC")
-        
-        # PubMed Central search
-        if "PubMed Central" in sources_to_search:
-            tasks.append(self.pmc_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("PubMed Central")
-        
-        # PubMed search
-        if "PubMed" in sources_to_search:
-            tasks.append(self.pubmed_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level
-            ))
-            sources_queried.append("PubMed")
-        
-        # Semantic Scholar search
-        if "Semantic Scholar" in sources_to_search:
-            tasks.append(self.semantic_scholar_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level
-            ))
-            sources_queried.append("Semantic Scholar")
-        
-        # OpenAlex search (MASSIVE database - 200M+ papers) - using existing one
-        if "OpenAlex" in sources_to_search:
-            tasks.append(self.openalex_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("OpenAlex")
-        
-        # arXiv search (preprints and STEM papers)
-        if "arXiv" in sources_to_search:
-            tasks.append(self.arxiv_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("arXiv")
-        
-        # Crossref search (scholarly metadata)
-        if "Crossref" in sources_to_search:
-            tasks.append(self.crossref_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("Crossref")
-        
-        # DOAB search (open access books)
-        if "DOAB" in sources_to_search:
-            tasks.append(self.doab_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("DOAB")
-        
-        # Project Gutenberg search (public domain books)
-        if "Project Gutenberg" in sources_to_search:
-            tasks.append(self.project_gutenberg_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("Project Gutenberg")
-        
-        # Internet Archive search (digital library)
-        if "Internet Archive" in sources_to_search:
-            tasks.append(self.internet_archive_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("Internet Archive")
-        
-        # Open Library search (book metadata)
-        if "Open Library" in sources_to_search:
-            tasks.append(self.open_library_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("Open Library")
-        
-        # OpenStax search (free textbooks)
-        if "OpenStax" in sources_to_search:
-            tasks.append(self.openstax_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("OpenStax")
-        
-        # OAPEN search (academic books)
-        if "OAPEN" in sources_to_search:
-            tasks.append(self.oapen_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("OAPEN")
-        
-        # HathiTrust search (digital library) - commented out as client not working
-        # if "HathiTrust" in sources_to_search:
-        #     tasks.append(self.hathitrust_client.search(
-        #         query=enhanced_query,
-        #         year_start=request.year_start,
-        #         year_end=request.year_end,
-        #         discipline=request.discipline,
-        #         education_level=request.education_level,
-        #         limit=50
-        #     ))
-        #     sources_queried.append("HathiTrust")
-        
-        # Biodiversity Heritage Library search
-        if "BHL" in sources_to_search:
-            tasks.append(self.biodiversity_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=30
-            ))
-            sources_queried.append("BHL")
+        sources_to_search = request.sources if request.sources else DEFAULT_SOURCES
         
-        # NLM Bookshelf search (medical textbooks)
-        if "NLM Bookshelf" in sources_to_search:
-            tasks.append(self.nlm_bookshelf_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=30
-            ))
-            sources_queried.append("NLM Bookshelf")
-        
-        # PLOS search (open access science)
-        if "PLOS" in sources_to_search:
-            tasks.append(self.plos_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("PLOS")
-        
-        # BioMed Central search (biomedical research)
-        if "BioMed Central" in sources_to_search:
-            tasks.append(self.biomed_central_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("BioMed Central")
-        
-        # Unpaywall search (free versions of papers)
-        if "Unpaywall" in sources_to_search:
-            tasks.append(self.unpaywall_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("Unpaywall")
-        
-        # MDPI search (multidisciplinary open access) - commented out as client not working
-        # if "MDPI" in sources_to_search:
-        #     tasks.append(self.mdpi_client.search(
-        #         query=enhanced_query,
-        #         year_start=request.year_start,
-        #         year_end=request.year_end,
-        #         discipline=request.discipline,
-        #         education_level=request.education_level,
-        #         limit=75
-        #     ))
-        #     sources_queried.append("MDPI")
-        
-        # Google Books search (academic books and texts)
-        if "Google Books" in sources_to_search:
-            tasks.append(self.google_books_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50
-            ))
-            sources_queried.append("Google Books")
-        
-        # Google Search (PDF-only search across the web)
-        if "Google Search" in sources_to_search:
-            tasks.append(self.google_search_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=50  # Increased limit for more PDF results
-            ))
-            sources_queried.append("Google Search")
-        
-        # OER Sources
-        # Open Textbook Library
-        if "Open Textbook Library" in sources_to_search:
-            tasks.append(self.open_textbook_library_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("Open Textbook Library")
-        
-        # Pressbooks
-        if "Pressbooks" in sources_to_search:
-            tasks.append(self.pressbooks_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("Pressbooks")
-        
-        # LibreTexts
-        if "LibreTexts" in sources_to_search:
-            tasks.append(self.libretexts_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("LibreTexts")
-        
-        # MERLOT
-        if "MERLOT" in sources_to_search:
-            tasks.append(self.merlot_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("MERLOT")
-        
-        # OER Commons
-        if "OER Commons" in sources_to_search:
-            tasks.append(self.oer_commons_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("OER Commons")
-        
-        # MIT OpenCourseWare
-        if "MIT OpenCourseWare" in sources_to_search:
-            tasks.append(self.mit_ocw_client.search(
-                query=enhanced_query,
-                max_results=50
-            ))
-            sources_queried.append("MIT OpenCourseWare")
-        
-        # BASE search (Bielefeld Academic Search Engine)
-        if "BASE" in sources_to_search:
-            tasks.append(self.base_client.search(
-                query=enhanced_query,
-                year_start=request.year_start,
-                year_end=request.year_end,
-                discipline=request.discipline,
-                education_level=request.education_level,
-                limit=75
-            ))
-            sources_queried.append("BASE")
+        for source_name, spec in SOURCES.items():
+            if source_name not in sources_to_search:
+                continue
+            
+            client = getattr(self, spec.client_attr)
+            if spec.oer:
+                # OER clients take a free-text query and a result cap only
+                search = client.search(query=enhanced_query, max_results=spec.limit)
+            else:
+                search_kwargs = dict(
+                    query=enhanced_query,
+                    year_start=request.year_start,
+                    year_end=request.year_end,
+                    discipline=request.discipline,
+                    education_level=request.education_level
+                )
+                if spec.limit is not None:
+                    search_kwargs["limit"] = spec.limit
+                search = client.search(**search_kwargs)
+            
+            # Give every source its own deadline so one slow API only loses its own results
+            tasks.append(asyncio.wait_for(search, timeout=SOURCE_TIMEOUT))
+            sources_queried.append(source_name)
         
-        # Execute all searches concurrently with improved timeout handling
-        try:
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=60.0  # Reasonable timeout
-            )
-        except asyncio.TimeoutError:
-            logger.error("Overall search timeout - some APIs may be slow")
-            results = [[] for _ in tasks]  # Return empty lists instead of None
+        # Execute all searches concurrently; timeouts and errors come back as exceptions
+        results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Organize results by source
         results_by_source = {}
@@ -555,7 +267,10 @@ class SearchService:
         
         for i, result in enumerate(results):
             source_name = sources_queried[i]
-            if isinstance(result, Exception):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.error(f"Timed out after {SOURCE_TIMEOUT}s waiting for {source_name}")
+                results_by_source[source_name] = []
+            elif isinstance(result, Exception):
                 logger.error(f"Error from {source_name}: {result}")
                 results_by_source[source_name] = []
             elif result:
@@ -754,4 +469,6 @@ class SearchService:
         # await self.mdpi_client.close()  # Not initialized
         await self.google_books_client.close()
         await self.google_search_client.close()
-        await self.base_client.close()
\ No newline at end of file
+        await self.base_client.close()
+        # Close the connection pool shared by all API clients
+        await close_shared_transport()
\ No newline at end of file
@@ -10,5 +10,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        loop="auto"  # uvloop (installed with uvicorn[standard]) where available
     )
\ No newline at end of file
@@ -0,0 +1,982 @@
+# tests/test_api_clients.py
+"""
+Unit tests for external API clients
+Tests normalization and enrichment logic without hitting the network
+"""
+
+import pytest
+import asyncio
+import httpx
+from unittest.mock import AsyncMock, patch
+from app.api_clients import eric, google_search, http, internet_archive, libretexts, libretexts_new, libretexts_pages, merlot, mit_ocw
+from app.api_clients.eric import ERICClient
+from app.api_clients.europe_pmc import EuropePMCClient
+from app.api_clients.google_books import GoogleBooksClient
+from app.api_clients.google_search import GoogleSearchClient
+from app.api_clients.internet_archive import InternetArchiveClient
+from app.api_clients.libretexts import LibreTextsClient
+from app.api_clients.libretexts_enhanced import LibreTextsEnhanced
+from app.api_clients.mit_ocw import MITOpenCourseWareClient
+
+def make_eric_doc(**overrides):
+    """Build a minimal ERIC document that passes the open access checks"""
+    doc = {
+        "id": "ED123456",
+        "title": "Play-Based Learning in Early Childhood",
+        "author": ["Smith, Jane", "Doe, John"],
+        "publicationdateyear": 2020,
+        "description": "A study of play-based learning.",
+        "e_fulltextauth": 1,
+        "publicationtype": ["Reports - Research"],
+    }
+    doc.update(overrides)
+    return doc
+
+@pytest.fixture(autouse=True)
+def clear_response_caches():
+    """Start every test with empty in-process API response caches"""
+    eric._citation_cache.clear()
+    eric._response_cache.clear()
+    google_search._page_cache.clear()
+    internet_archive._search_cache.clear()
+    libretexts._results_cache.clear()
+    libretexts_new._search_cache.clear()
+    libretexts_pages._page_cache.clear()
+    libretexts_pages._listing_cache.clear()
+    merlot._results_cache.clear()
+    mit_ocw._department_cache.clear()
+    mit_ocw._results_cache.clear()
+    yield
+    eric._citation_cache.clear()
+    eric._response_cache.clear()
+    google_search._page_cache.clear()
+    internet_archive._search_cache.clear()
+    libretexts._results_cache.clear()
+    libretexts_new._search_cache.clear()
+    libretexts_pages._page_cache.clear()
+    libretexts_pages._listing_cache.clear()
+    merlot._results_cache.clear()
+    mit_ocw._department_cache.clear()
+    mit_ocw._results_cache.clear()
+
+class TestERICClient:
+    """Test ERIC normalization and citation enrichment"""
+
+    def test_normalize_paper_builds_pdf_url(self):
+        """Test ED documents with full text resolve to a direct PDF URL"""
+        client = ERICClient()
+        paper = client.normalize_paper(make_eric_doc())
+
+        assert paper is not None
+        assert paper.full_text_url == "https://files.eric.ed.gov/fulltext/ED123456.pdf"
+        assert paper.authors == ["Smith, Jane", "Doe, John"]
+        assert paper.year == "2020"
+
+    def test_normalize_paper_rejects_paywall_domain(self):
+        """Test papers hosted on paywalled publishers are rejected"""
+        client = ERICClient()
+        doc = make_eric_doc(id="EJ999999", url="https://www.jstor.org/stable/12345")
+
+        assert client.normalize_paper(doc) is None
+
+    @pytest.mark.asyncio
+    async def test_citation_counts_assigned_by_doi(self):
+        """Test citation counts are looked up for papers with a DOI"""
+        client = ERICClient()
+        papers = [
+            client.normalize_paper(make_eric_doc(id="ED1", isbn="10.1000/a")),
+            client.normalize_paper(make_eric_doc(id="ED2")),
+            client.normalize_paper(make_eric_doc(id="ED3", isbn="10.1000/b")),
+        ]
+        lookup = AsyncMock(return_value={"10.1000/a": 4, "10.1000/b": 9})
+
+        with patch.object(client, "_fetch_citation_batch", lookup):
+            await client._add_citation_counts(papers)
+
+        assert [p.citation_count for p in papers] == [4, None, 9]
+        lookup.assert_awaited_once_with(["10.1000/a", "10.1000/b"])
+
+    @pytest.mark.asyncio
+    async def test_isbns_are_not_looked_up(self):
+        """Test ISBNs in the doi slot are skipped instead of queried as DOIs"""
+        client = ERICClient()
+        papers = [client.normalize_paper(make_eric_doc(isbn="978-0-13-468599-1"))]
+        lookup = AsyncMock(return_value={})
+
+        with patch.object(client, "_fetch_citation_batch", lookup):
+            await client._add_citation_counts(papers)
+
+        assert papers[0].citation_count is None
+        lookup.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_citation_lookups_are_batched(self):
+        """Test DOIs are split into batches of CITATION_BATCH_SIZE"""
+        client = ERICClient()
+        dois = [f"10.1000/{i}" for i in range(60)]
+        lookup = AsyncMock(return_value={})
+
+        with patch.object(client, "_fetch_citation_batch", lookup):
+            await client._get_citation_counts_bulk(dois)
+
+        assert [len(call.args[0]) for call in lookup.await_args_list] == [25, 25, 10]
+
+    @pytest.mark.asyncio
+    async def test_citation_counts_are_cached(self):
+        """Test repeat lookups, including misses, are served from the cache"""
+        client = ERICClient()
+        lookup = AsyncMock(return_value={"10.1000/a": 4, "10.1000/missing": None})
+
+        with patch.object(client, "_fetch_citation_batch", lookup):
+            first = await client._get_citation_counts_bulk(["10.1000/A", "10.1000/missing"])
+            second = await client._get_citation_counts_bulk(["10.1000/a", "10.1000/missing"])
+
+        assert first == second == {"10.1000/a": 4}
+        assert lookup.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_citation_batch_keeps_first_record_per_doi(self):
+        """Test duplicate records keep the first count, and misses are only known on a partial page"""
+        pages = []
+
+        def handler(request):
+            assert request.url.params["pageSize"] == str(eric.CITATION_PAGE_SIZE)
+            return httpx.Response(200, json={"resultList": {"result": pages.pop(0)}})
+
+        client = ERICClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        records = [
+            {"doi": "10.1000/A", "citedByCount": 4},
+            {"doi": "10.1000/a", "citedByCount": 9},
+            {"doi": "10.1000/other", "citedByCount": 1},
+        ]
+        pages.append(records)
+        pages.append(records + [{"doi": "10.1000/a"}] * (eric.CITATION_PAGE_SIZE - len(records)))
+
+        partial = await client._fetch_citation_batch(["10.1000/a", "10.1000/missing"])
+        full = await client._fetch_citation_batch(["10.1000/a", "10.1000/missing"])
+
+        assert partial == {"10.1000/a": 4, "10.1000/missing": None}
+        assert full == {"10.1000/a": 4}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_are_coalesced(self):
+        """Test concurrent searches for the same DOI share one request"""
+        client = ERICClient()
+
+        async def slow_lookup(batch):
+            await asyncio.sleep(0.01)
+            return {"10.1000/a": 7}
+
+        lookup = AsyncMock(side_effect=slow_lookup)
+
+        with patch.object(client, "_fetch_citation_batch", lookup):
+            results = await asyncio.gather(
+                client._get_citation_counts_bulk(["10.1000/a"]),
+                client._get_citation_counts_bulk(["10.1000/a"]),
+            )
+
+        assert results == [{"10.1000/a": 7}, {"10.1000/a": 7}]
+        assert lookup.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_search_responses_are_cached_and_revalidated(self):
+        """Test repeat searches use the cached page, then revalidate with the ETag"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            payload = {"response": {"docs": [make_eric_doc(id="ED1"), make_eric_doc(id="ED2")]}}
+            return httpx.Response(200, json=payload, headers={"ETag": '"v1"'})
+
+        client = ERICClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.search("play", 2000, 2024, limit=2)
+        second = await client.search("play", 2000, 2024, limit=2)
+        assert len(requests) == 1
+
+        for entry in eric._response_cache._data.values():
+            entry[0].fresh_until = 0
+        third = await client.search("play", 2000, 2024, limit=2)
+
+        assert len(requests) == 2
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert [p.title for p in first] == [p.title for p in second] == [p.title for p in third]
+
+    @pytest.mark.asyncio
+    async def test_partly_read_cached_page_is_fetched_again(self):
+        """Test a cached page that was only partly read is refetched when it runs out before the limit"""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("If-None-Match") == '"v1"':
+                return httpx.Response(304)
+            docs = [make_eric_doc(id=f"ED{i}") for i in range(1, 4)]
+            return httpx.Response(200, json={"response": {"docs": docs}}, headers={"ETag": '"v1"'})
+
+        client = ERICClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await client.search("play", 2000, 2024, limit=2)
+        [(entry, _)] = eric._response_cache._data.values()
+        assert entry.complete is False
+        entry.docs[0] = make_eric_doc(url="https://www.jstor.org/stable/1")
+        entry.fresh_until = 0
+
+        papers = await client.search("play", 2000, 2024, limit=2)
+
+        assert len(requests) == 3
+        assert requests[1].headers["If-None-Match"] == '"v1"'
+        assert "If-None-Match" not in requests[2].headers
+        assert [p.full_text_url for p in papers] == [
+            "https://files.eric.ed.gov/fulltext/ED1.pdf",
+            "https://files.eric.ed.gov/fulltext/ED2.pdf",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_pages_until_limit_reached(self):
+        """Test further pages are only fetched while too few papers were accepted"""
+        starts = []
+        rejected = make_eric_doc(url="https://www.jstor.org/stable/1")
+
+        def handler(request):
+            start = int(request.url.params["start"])
+            starts.append(start)
+            docs = [rejected, rejected] if start == 0 else [make_eric_doc(id=f"ED{start}")]
+            return httpx.Response(200, json={"response": {"docs": docs}})
+
+        client = ERICClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        papers = await client.search("play", 2000, 2024, limit=2)
+
+        assert starts == [0, 2]
+        assert [p.full_text_url for p in papers] == ["https://files.eric.ed.gov/fulltext/ED2.pdf"]
+
+def make_europe_pmc_result(**overrides):
+    """Build a minimal Europe PMC core result that passes the open access checks"""
+    result = {
+        "title": "Gut Microbiome and Early Development",
+        "authorString": "Smith J, Doe J.",
+        "pubYear": "2021",
+        "isOpenAccess": "Y",
+        "hasPDF": "Y",
+        "pubType": "research-article",
+        "license": "cc by",
+        "pmcid": "PMC123456",
+    }
+    result.update(overrides)
+    return result
+
+class TestEuropePMCClient:
+    """Test Europe PMC normalization and URL classification"""
+
+    def test_normalize_paper_builds_pdf_url_from_pmcid(self):
+        """Test open access papers without a URL list fall back to the PMC render URL"""
+        paper = EuropePMCClient().normalize_paper(make_europe_pmc_result())
+
+        assert paper is not None
+        assert paper.full_text_url == "https://europepmc.org/backend/ptpmcrender.fcgi?accid=PMC123456&blobtype=pdf"
+        assert paper.year == "2021"
+        assert paper.authors == ["Smith J", "Doe J."]
+
+    def test_normalize_paper_prefers_pdf_then_pmc_urls(self):
+        """Test PDF URLs win over PMC URLs, which win over the first listed URL"""
+        client = EuropePMCClient()
+        doi_url = {"url": "https://doi.org/10.1000/a", "documentStyle": "doi"}
+        pmc_url = {"url": "https://europepmc.org/articles/PMC222", "documentStyle": "html"}
+        ncbi_pdf = {"url": "https://www.ncbi.nlm.nih.gov/pmc/articles/PMC111/pdf/a.pdf", "documentStyle": "pdf"}
+
+        def select(*urls):
+            result = make_europe_pmc_result(fullTextUrlList={"fullTextUrl": list(urls)})
+            return client.normalize_paper(result).full_text_url
+
+        assert select(doi_url, pmc_url, ncbi_pdf) == "https://europepmc.org/backend/ptpmcrender.fcgi?accid=PMC111&blobtype=pdf"
+        assert select(doi_url, pmc_url) == "https://europepmc.org/backend/ptpmcrender.fcgi?accid=PMC222&blobtype=pdf"
+        assert select(doi_url) == "https://doi.org/10.1000/a"
+
+    @pytest.mark.parametrize("overrides", [
+        {"isOpenAccess": "N"},
+        {"hasPDF": "N"},
+        {"pubType": "Editorial"},
+        {"license": "All rights reserved"},
+    ])
+    def test_normalize_paper_rejects_non_open_articles(self, overrides):
+        """Test closed, PDF-less, non-article and restrictively licensed papers are rejected"""
+        assert EuropePMCClient().normalize_paper(make_europe_pmc_result(**overrides)) is None
+
+    @pytest.mark.asyncio
+    async def test_search_query_includes_filters(self):
+        """Test the open access filters and optional terms are ANDed onto the query"""
+        queries = []
+
+        def handler(request):
+            queries.append(request.url.params["query"])
+            return httpx.Response(200, json={"resultList": {"result": [make_europe_pmc_result()]}})
+
+        client = EuropePMCClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        papers = await client.search("microbiome", 2010, 2020, discipline="Psychology")
+
+        assert len(papers) == 1
+        assert queries == [
+            "microbiome AND OPEN_ACCESS:y AND LICENSE:cc* AND HAS_PDF:y"
+            " AND FIRST_PDATE:[2000-01-01 TO 2025-12-31] AND PUB_YEAR:[2010 TO 2020]"
+            " AND (psychology OR cognitive)"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_stops_at_limit(self):
+        """Test streaming stops once limit papers have been accepted"""
+        results = [make_europe_pmc_result(title=f"Paper {i}") for i in range(5)]
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, json={"resultList": {"result": results}})
+        )
+
+        client = EuropePMCClient()
+        client.client = httpx.AsyncClient(transport=transport)
+
+        papers = await client.search("microbiome", 2010, 2020, limit=2)
+
+        assert [p.title for p in papers] == ["Paper 0", "Paper 1"]
+
+    @pytest.mark.parametrize("url,expected", [
+        ("https://example.org/article/ABSTRACT", True),
+        ("https://example.org/view?summary=1", True),
+        ("https://example.org/view?id=1&abstract", True),
+        ("https://www.ncbi.nlm.nih.gov/pmc/articles/PMC123/", False),
+        ("https://example.org/abstracts/123", True),
+        ("https://example.org/paper.pdf", False),
+    ])
+    def test_is_abstract_only_url(self, url, expected):
+        """Test abstract and summary markers are detected case-insensitively"""
+        assert EuropePMCClient()._is_abstract_only_url(url) is expected
+
+def make_google_book(**overrides):
+    """Build a minimal Google Books volume that converts to a Paper"""
+    item = {
+        "volumeInfo": {"title": "Learning Through Play", "authors": ["Jane Smith"], "publishedDate": "2019-04-01"},
+        "accessInfo": {"viewability": "PARTIAL", "webReaderLink": "https://books.google.com/books/reader?id=1"},
+    }
+    item.update(overrides)
+    return item
+
+class TestGoogleBooksClient:
+    """Test Google Books searching and conversion"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_are_not_serialized(self):
+        """Test concurrent searches within the rate limit run in parallel"""
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return httpx.Response(200, json={"items": [make_google_book()]})
+
+        client = GoogleBooksClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        results = await asyncio.gather(*(client.search(f"play {i}", 2000, 2024) for i in range(3)))
+
+        assert [len(papers) for papers in results] == [1, 1, 1]
+        assert max(peak) == 3
+
+    def test_book_to_paper_extracts_isbn(self):
+        """Test ISBN identifiers are picked up and other identifiers ignored"""
+        volume = make_google_book()["volumeInfo"]
+        volume["industryIdentifiers"] = [
+            {"type": "OTHER", "identifier": "OCLC:1"},
+            {"type": "ISBN_13", "identifier": "9780134685991"},
+        ]
+        paper = GoogleBooksClient()._book_to_paper(make_google_book(volumeInfo=volume), 2000, 2024)
+
+        assert paper.isbn == "9780134685991"
+        assert paper.year == "2019"
+
+    def test_book_to_paper_cleans_description(self):
+        """Test HTML tags are removed and whitespace collapsed in descriptions"""
+        volume = make_google_book()["volumeInfo"]
+        volume["description"] = "<p>Play <b>matters</b>\n\n for <br/>children.</p> "
+        paper = GoogleBooksClient()._book_to_paper(make_google_book(volumeInfo=volume), 2000, 2024)
+
+        assert paper.abstract == "Play matters for children."
+
+    def test_book_to_paper_applies_year_filter(self):
+        """Test books published outside the requested range are skipped"""
+        client = GoogleBooksClient()
+
+        assert client._book_to_paper(make_google_book(), 2020, 2024) is None
+        assert client._book_to_paper(make_google_book(), 0, 0) is not None
+
+    def test_book_to_paper_rejects_inaccessible_books(self):
+        """Test books without any viewable pages are skipped"""
+        item = make_google_book(accessInfo={"viewability": "NO_PAGES", "previewLink": "https://books.google.com/x"})
+
+        assert GoogleBooksClient()._book_to_paper(item, 2000, 2024) is None
+
+def make_google_result(n):
+    """Build a Google Custom Search item pointing at an open PDF"""
+    return {
+        "title": f"[PDF] Play and Learning {n}",
+        "link": f"https://example.edu/papers/{n}.pdf",
+        "snippet": "A 2019 study of play.",
+        "displayLink": "example.edu",
+    }
+
+class TestGoogleSearchClient:
+    """Test Google Custom Search PDF results"""
+
+    @pytest.mark.asyncio
+    async def test_search_fetches_pages_concurrently(self):
+        """Test all result pages are requested together and kept in page order"""
+        requested = []
+
+        async def handler(request):
+            start, num = int(request.url.params["start"]), int(request.url.params["num"])
+            requested.append((start, num))
+            await asyncio.sleep(0.01 if start == 1 else 0)
+            return httpx.Response(200, json={"items": [make_google_result(start + i) for i in range(num)]})
+
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        papers = await client.search("play", 2000, 2024, limit=25)
+
+        assert sorted(requested) == [(1, 10), (11, 10), (21, 5)]
+        assert [p.full_text_url for p in papers] == [f"https://example.edu/papers/{n}.pdf" for n in range(1, 26)]
+        assert papers[0].title == "Play and Learning 1"
+
+    @pytest.mark.asyncio
+    async def test_result_pages_are_cached(self):
+        """Test a repeated search is served from the page cache"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"items": [make_google_result(1)]})
+
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.search("play", 2000, 2024, limit=5)
+        second = await client.search("play", 2000, 2024, limit=5)
+
+        assert len(calls) == 1
+        assert [p.title for p in first] == [p.title for p in second]
+        assert first[0] is not second[0]
+
+    @pytest.mark.asyncio
+    async def test_links_repeated_across_pages_are_dropped(self):
+        """Test a link returned on two pages yields a single paper"""
+        def handler(request):
+            start = int(request.url.params["start"])
+            numbers = [1, 2] if start == 1 else [2, 3]
+            return httpx.Response(200, json={"items": [make_google_result(n) for n in numbers]})
+
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        papers = await client.search("play", 2000, 2024, limit=20)
+
+        assert [p.full_text_url for p in papers] == [f"https://example.edu/papers/{n}.pdf" for n in (1, 2, 3)]
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_page_is_retried_at_a_lower_rate(self):
+        """Test a 429 is retried after Retry-After and halves the request rate"""
+        statuses = iter([429, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status == 429:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return httpx.Response(200, json={"items": [make_google_result(1)]})
+
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with patch.object(google_search.asyncio, "sleep", AsyncMock()) as sleep:
+            papers = await client.search("play", 2000, 2024, limit=5)
+
+        sleep.assert_awaited_once_with(2.0)
+        assert len(papers) == 1
+        assert client._limiter.max_rate == google_search.REQUESTS_PER_SECOND / 2
+
+    @pytest.mark.parametrize("url,expected", [
+        ("https://example.edu/paper.pdf", True),
+        ("https://www.nature.com/articles/a.pdf", False),
+        ("https://link.springer.com:443/content/a.PDF", False),
+        ("https://jstor.org/stable/a.pdf", False),
+        ("https://signature.com/a.pdf", True),
+        ("http://example.edu/paper.pdf", False),
+        ("https://example.edu/paper.html", False),
+    ])
+    def test_is_valid_pdf_url(self, url, expected):
+        """Test HTTPS PDF links are accepted unless hosted on a blocked domain"""
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+
+        assert client._is_valid_pdf_url(url) is expected
+
+    @pytest.mark.parametrize("title,snippet,expected", [
+        ("Recess", "Written by JANE SMITH. A study", ["Jane Smith"]),
+        ("Author: Mary Jones", "Jones Brown et al found that", ["Jones Brown"]),
+        ("Author: Mary Jones.", "Smith Jones et al. 2019", ["Mary Jones", "Smith Jones"]),
+        ("Play in School", "No names in this snippet.", []),
+    ])
+    def test_extract_authors_from_text(self, title, snippet, expected):
+        """Test the first name of at most three words is taken per author pattern"""
+        client = GoogleSearchClient(api_key="key", search_engine_id="cx")
+
+        assert client._extract_authors_from_text(title, snippet) == expected
+
+def make_archive_doc(**overrides):
+    """Build a minimal Internet Archive search doc with a full-text format"""
+    doc = {
+        "identifier": "playlearning00smit",
+        "title": "Play and  Learning",
+        "creator": ["Smith, Jane (1950-)"],
+        "description": "<p>A book about play.</p>",
+        "date": "1999-01-01T00:00:00Z",
+        "format": ["Text PDF", "EPUB"],
+    }
+    doc.update(overrides)
+    return doc
+
+class TestInternetArchiveClient:
+    """Test Internet Archive searching and normalization"""
+
+    @pytest.mark.asyncio
+    async def test_search_results_are_cached(self):
+        """Test a repeated search reuses the cached docs"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"response": {"docs": [make_archive_doc()]}})
+
+        client = InternetArchiveClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await client.search("play", 1990, 2000)
+        second = await client.search("play", 1990, 2000)
+
+        assert len(calls) == 1
+        assert [b.title for b in first] == [b.title for b in second] == ["Play and Learning"]
+        assert first[0].authors == ["Smith, Jane"]
+
+    @pytest.mark.asyncio
+    async def test_server_errors_are_retried_with_backoff(self):
+        """Test transient 5xx responses are retried until the request succeeds"""
+        statuses = iter([503, 502, 200])
+
+        def handler(request):
+            status = next(statuses)
+            if status != 200:
+                return httpx.Response(status)
+            return httpx.Response(200, json={"response": {"docs": [make_archive_doc()]}})
+
+        client = InternetArchiveClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with patch.object(internet_archive.asyncio, "sleep", AsyncMock()) as sleep, \
+                patch.object(http.random, "uniform", return_value=0.5):
+            books = await client.search("play", 1990, 2000)
+
+        assert [call.args[0] for call in sleep.await_args_list] == [1.5, 2.5]
+        assert [b.title for b in books] == ["Play and Learning"]
+
+    @pytest.mark.asyncio
+    async def test_persistent_errors_give_up_after_last_attempt(self):
+        """Test a search returns nothing once every retry has failed"""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        client = InternetArchiveClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        with patch.object(internet_archive.asyncio, "sleep", AsyncMock()):
+            books = await client.search("play", 1990, 2000)
+
+        assert books == []
+        assert len(calls) == 4
+
+    @pytest.mark.parametrize("overrides", [
+        {"format": ["Metadata", "JPEG"]},
+        {"identifier": ""},
+        {"title": "  "},
+    ])
+    def test_normalize_paper_rejects_items_without_full_text(self, overrides):
+        """Test items without a readable format, identifier or title are skipped"""
+        assert InternetArchiveClient().normalize_paper(make_archive_doc(**overrides)) is None
+
+    @pytest.mark.parametrize("formats,expected", [
+        (["Text PDF", "text pdf", "JPEG", "DjVuTXT"], ["TEXT PDF", "DJVUTXT"]),
+        ("Kindle MOBI", ["KINDLE MOBI"]),
+    ])
+    def test_normalize_paper_keeps_full_text_formats(self, formats, expected):
+        """Test readable formats are upper-cased and listed once each"""
+        book = InternetArchiveClient().normalize_paper(make_archive_doc(format=formats))
+
+        assert book.download_formats == expected
+
+    def test_list_fields_use_their_first_value(self):
+        """Test single-valued fields accept either a string or a list"""
+        book = InternetArchiveClient().normalize_paper(make_archive_doc(
+            date=["c. 1998", "1999"], publisher=["Harper", "Dover"], language=[],
+        ))
+
+        assert (book.year, book.publisher, book.language) == ("1998", "Harper", "")
+
+    def test_long_abstract_is_cut_at_a_word_boundary(self):
+        """Test descriptions over 500 characters end on a whole word"""
+        book = InternetArchiveClient().normalize_paper(make_archive_doc(description="play " * 200))
+
+        assert book.abstract == ("play " * 100).strip() + "..."
+
+    @pytest.mark.asyncio
+    async def test_search_query_includes_filters(self):
+        """Test the collection, year and discipline filters are added to the query"""
+        queries = []
+
+        def handler(request):
+            queries.append(request.url.params["q"])
+            return httpx.Response(200, json={"response": {"docs": []}})
+
+        client = InternetArchiveClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        await client.search("play", 1990, None, discipline="History")
+
+        assert queries == [
+            "(play) AND mediatype:(texts OR books)"
+            " AND (collection:opensource OR collection:gutenberg OR collection:internetarchivebooks)"
+            " AND NOT collection:inlibrary AND year:[1990 TO *]"
+            " AND (history OR historical OR civilization OR culture)"
+        ]
+
+class TestFetchJson:
+    """Test the shared JSON helper used by the OER clients"""
+
+    @pytest.mark.asyncio
+    async def test_calls_share_one_pooled_client(self):
+        """Test repeat calls reuse a client and send per-call headers"""
+        agents = []
+
+        def handler(request):
+            agents.append(request.headers["User-Agent"])
+            return httpx.Response(200, json={"ok": True})
+
+        transport = httpx.MockTransport(handler)
+        with patch.object(http, "get_shared_transport", return_value=transport), \
+                patch.object(http, "_json_client", None):
+            first = await http.fetch_json("https://example.org/a")
+            client = http._json_client
+            second = await http.fetch_json("https://example.org/b", ua="Custom/1.0")
+
+            assert http._json_client is client
+
+        assert first == second == {"ok": True}
+        assert agents == ["OpenScholar/1.0", "Custom/1.0"]
+
+class TestRetryDelay:
+    """Test the backoff between retries of transient failures"""
+
+    @pytest.mark.parametrize("headers,attempt,expected", [
+        ({"Retry-After": "7"}, 0, 7.0),
+        ({"Retry-After": "600"}, 0, http.RETRY_MAX_DELAY),
+        ({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 0, 0.0),
+        ({"Retry-After": "soon"}, 2, 4.5),
+        ({}, 0, 1.5),
+        ({}, 3, 8.5),
+        ({}, 10, http.RETRY_MAX_DELAY),
+    ])
+    def test_retry_delay(self, headers, attempt, expected):
+        """Test Retry-After is honoured, otherwise backoff doubles per attempt"""
+        response = httpx.Response(503, headers=headers)
+
+        with patch.object(http.random, "uniform", return_value=0.5):
+            assert http.retry_delay(response, attempt) == expected
+
+class TestIterJsonItems:
+    """Test incremental parsing of streamed JSON responses"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_ijson", [True, False])
+    async def test_yields_items_under_prefix(self, use_ijson):
+        """Test items are yielded with and without ijson installed"""
+        payload = {"response": {"numFound": 2, "docs": [{"id": "ED1"}, {"id": "ED2"}]}}
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+
+        with patch.object(http, "IJSON_AVAILABLE", use_ijson and http.IJSON_AVAILABLE):
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream("GET", "https://example.org/") as response:
+                    docs = [doc async for doc in http.iter_json_items(response, "response.docs.item")]
+
+        assert docs == [{"id": "ED1"}, {"id": "ED2"}]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_ijson", [True, False])
+    async def test_oversized_body_is_refused(self, use_ijson):
+        """Test bodies larger than max_bytes raise instead of being buffered"""
+        payload = {"response": {"docs": [{"id": f"ED{i}"} for i in range(100)]}}
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=payload))
+
+        with patch.object(http, "IJSON_AVAILABLE", use_ijson and http.IJSON_AVAILABLE):
+            async with httpx.AsyncClient(transport=transport) as client:
+                async with client.stream("GET", "https://example.org/") as response:
+                    with pytest.raises(ValueError):
+                        [doc async for doc in http.iter_json_items(response, "response.docs.item", max_bytes=100)]
+
+class TestLibreTextsPages:
+    """Test parsing of LibreTexts bookshelf listings"""
+
+    def test_listing_books(self):
+        """Test listing entries yield their title span, or the link title as a fallback"""
+        page = (
+            '<ul class="mt-sortable-listings-container">'
+            '<li class="mt-sortable-listing"><a class="mt-sortable-listing-link" href="/Bookshelves/A_(Smith)">'
+            '<span class="mt-sortable-listing-title"> Calculus <b>(Smith)</b> </span></a></li>'
+            '<li class="other mt-sortable-listing"><a class="mt-sortable-listing-link" href="/Bookshelves/B"'
+            ' title="Álgebra (Núñez): notes"></a></li>'
+            '<li class="mt-sortable-listing"><a href="/Bookshelves/C">No listing link</a></li>'
+            '</ul>'
+        ).encode()
+        response = httpx.Response(200, content=page, headers={"Content-Type": "text/html"})
+
+        tree = libretexts_pages.parse_html(response)
+
+        assert libretexts_pages.listing_books(tree) == [
+            ("Calculus(Smith)", "/Bookshelves/A_(Smith)"),
+            ("Álgebra (Núñez)", "/Bookshelves/B"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_category_books_parses_streamed_chunks(self):
+        """Test category pages are parsed chunk by chunk, even with characters split across chunks"""
+        page = make_listing_page(("/Bookshelves/Cat/Géométrie", "Géométrie")).encode()
+        split = page.index("é".encode()) + 1
+
+        async def chunks():
+            yield page[:split]
+            yield page[split:]
+
+        def handler(request):
+            return httpx.Response(200, content=chunks(), headers={"Content-Type": "text/html; charset=utf-8"})
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            books = await libretexts_pages.category_books(
+                client, "https://math.libretexts.org/Bookshelves/Cat", asyncio.Semaphore(1)
+            )
+
+        assert books == (("Géométrie", "/Bookshelves/Cat/Géométrie"),)
+
+def make_listing_page(*books):
+    """Build a LibreTexts page listing (href, title) pairs as mt-sortable-listing entries"""
+    items = "".join(
+        f'<li class="mt-sortable-listing"><a class="mt-sortable-listing-link" href="{href}">'
+        f'<span class="mt-sortable-listing-title">{title}</span></a></li>'
+        for href, title in books
+    )
+    return f"<html><body><ul>{items}</ul></body></html>"
+
+class TestLibreTextsClient:
+    """Test LibreTexts bookshelf scraping"""
+
+    @pytest.mark.asyncio
+    async def test_search_drills_into_categories(self):
+        """Test matching books are collected from the bookshelf and its category pages"""
+        pages = {
+            "/Bookshelves": make_listing_page(
+                ("https://math.libretexts.org/Bookshelves/Calculus", "Calculus"),
+                ("/Bookshelves/Calculus_Primer_(Lee)", "Calculus Primer (Lee)"),
+            ),
+            "/Bookshelves/Calculus": make_listing_page(
+                ("/Bookshelves/Calculus/Active_Calculus_(Boelkins)", "Active Calculus (Boelkins)"),
+                ("/Bookshelves/Calculus/Map", "Map: Calculus"),
+            ),
+        }
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            page = pages.get(request.url.path)
+            return httpx.Response(200, html=page) if page else httpx.Response(404)
+
+        client = LibreTextsClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._api.search = AsyncMock(return_value=[])
+
+        papers = await client.search("calculus", max_results=10)
+
+        assert [p.full_text_url for p in papers] == [
+            f"https://{host}.libretexts.org{path}"
+            for host in ("math", "chem", "bio", "phys")
+            for path in ("/Bookshelves/Calculus_Primer_(Lee)", "/Bookshelves/Calculus/Active_Calculus_(Boelkins)")
+        ]
+        # Every library links the same category page, which is fetched only once
+        assert requested.count("/Bookshelves/Calculus") == 1
+
+        await client.search("calculus", max_results=10)
+
+        assert len(requested) == 5
+
+    @pytest.mark.asyncio
+    async def test_categories_come_from_main_content(self):
+        """Test category links in the page navigation are not drilled into"""
+        listing = make_listing_page(("https://math.libretexts.org/Bookshelves/Calculus", "Calculus"))
+        pages = {
+            "/Bookshelves": listing.replace(
+                "<body>",
+                '<body><nav><a href="https://math.libretexts.org/Bookshelves/Algebra">Algebra</a></nav><main>'
+            ).replace("</body>", "</main></body>"),
+        }
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            page = pages.get(request.url.path)
+            return httpx.Response(200, html=page) if page else httpx.Response(404)
+
+        client = LibreTextsClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._api.search = AsyncMock(return_value=[])
+
+        await client.search("mathematics", max_results=10)
+
+        assert requested == ["/Bookshelves", "/Bookshelves/Calculus"]
+
+    @pytest.mark.asyncio
+    async def test_search_prefers_json_api(self):
+        """Test API results are returned as is, without scraping the bookshelves"""
+        item = {"title": "Calculus (Lee)", "author": "Lee", "url": "https://math.libretexts.org/Bookshelves/C"}
+        fetch = AsyncMock(return_value={"results": [item]})
+
+        client = LibreTextsClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: pytest.fail("scraped")))
+
+        with patch.object(libretexts_new, "fetch_json", fetch):
+            first = await client.search("calculus", max_results=5)
+            second = await client.search("calculus", max_results=5)
+
+        assert [p.authors for p in first] == [p.authors for p in second] == [["Lee"]]
+        assert first[0].year == "Unknown"
+        fetch.assert_awaited_once_with(libretexts_new.LibreTextsClient._URL, params={"q": "calculus", "limit": 5})
+
+    @pytest.mark.asyncio
+    async def test_search_results_are_cached_as_copies(self):
+        """Test repeat searches are served from the results cache without sharing Paper objects"""
+        client = LibreTextsClient()
+        client._search = AsyncMock(return_value=[libretexts._make_libretexts_paper("Calculus (Lee)", "u", "mathematics")])
+
+        first = await client.search("calculus", max_results=5)
+        first[0].title = "changed"
+        second = await client.search("calculus", max_results=5)
+        await client.search("calculus", max_results=6)
+
+        assert second[0].title == "Calculus (Lee)"
+        assert client._search.await_count == 2
+
+    @pytest.mark.parametrize("href,is_category", [
+        ("https://math.libretexts.org/Bookshelves/Calculus", True),
+        ("https://math.libretexts.org/Bookshelves/Calculus/Map", False),
+        ("https://math.libretexts.org/Bookshelves/", False),
+        ("/Bookshelves/Calculus", False),
+        ("https://math.libretexts.org/Courses/Calculus", False),
+    ])
+    def test_category_href_pattern(self, href, is_category):
+        """Test only absolute links one level below Bookshelves count as categories"""
+        assert bool(libretexts._CATEGORY_HREF_RE.match(href)) is is_category
+
+class TestLibreTextsEnhanced:
+    """Test LibreTexts library selection"""
+
+    @pytest.mark.parametrize("query,expected", [
+        ("intro to mathematics", ["mathematics", "statistics"]),
+        ("biostatistics for medicine", ["statistics", "mathematics", "medicine", "biology"]),
+        ("physicscience", ["physics", "biology", "chemistry", "geosciences"]),
+        ("poetry", ["mathematics", "biology", "chemistry", "physics", "humanities", "social_sciences"]),
+    ])
+    def test_select_libraries(self, query, expected):
+        """Test keywords match anywhere in the query, in order, with the STEM default otherwise"""
+        selected = LibreTextsEnhanced()._select_libraries(query)
+
+        assert [lib for lib, _ in selected] == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("host", ["math.libretexts.org", "bio.libretexts.org"])
+    async def test_search_stops_other_libraries_once_full(self, host):
+        """Test the first library to fill max_results is not held up by the others, which are cancelled"""
+        results = "".join(
+            f'<div class="searchresult"><a href="/Courses/Poetry_{i}">Poetry {i}</a></div>' for i in range(2)
+        )
+        stalled = asyncio.Event()
+
+        async def handler(request):
+            if request.url.host == host:
+                return httpx.Response(200, html=f"<html><body>{results}</body></html>")
+            await stalled.wait()
+
+        client = LibreTextsEnhanced()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        papers = await asyncio.wait_for(client.search("poetry", max_results=2), timeout=1)
+
+        assert [p.full_text_url for p in papers] == [
+            f"https://{host}/Courses/Poetry_0",
+            f"https://{host}/Courses/Poetry_1",
+        ]
+
+class TestMITOpenCourseWareClient:
+    """Test MIT OpenCourseWare department scraping"""
+
+    @pytest.mark.asyncio
+    async def test_department_pages_are_cached(self):
+        """Test department listings are parsed once and filtered again for each query"""
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            dept = request.url.path.strip("/").split("/")[-1]
+            cards = "".join(
+                f'<a href="/courses/{dept}-{topic}/"><h3 class="course-title">{dept.title()} {topic}</h3></a>'
+                for topic in ("Calculus", "Waves")
+            )
+            return httpx.Response(200, html=f"<html><body>{cards}</body></html>")
+
+        client = MITOpenCourseWareClient()
+        client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        calculus = await client.search("calculus", max_results=50)
+        waves = await client.search("waves", max_results=50)
+
+        assert len(requested) == 6
+        assert [p.full_text_url for p in calculus[:2]] == [
+            "https://ocw.mit.edu/courses/mathematics-Calculus/",
+            "https://ocw.mit.edu/courses/physics-Calculus/",
+        ]
+        assert len(calculus) == len(waves) == 6
+
+    @pytest.mark.asyncio
+    async def test_search_results_are_cached_per_credentials(self):
+        """Test clients with different API keys or CSE IDs never share cached results"""
+        paper = libretexts._make_libretexts_paper("Calculus", "u", "mathematics")
+        clients = [MITOpenCourseWareClient(), MITOpenCourseWareClient(api_key="key"), MITOpenCourseWareClient(api_key="key")]
+        clients[2].cse_id = "other-cse"
+        for client in clients:
+            client._search = AsyncMock(return_value=[paper])
+
+        for client in clients + clients:
+            await client.search("calculus", max_results=5)
+
+        assert [client._search.await_count for client in clients] == [1, 1, 1]
@@ -14,6 +14,7 @@ from app.cache.redis_cache import (
     RedisCache,
     CacheManager
 )
+from app.cache.memory_cache import TTLCache
 
 class TestCacheKeyBuilder:
     """Test cache key generation"""
@@ -105,6 +106,38 @@ class TestSimpleCache:
         assert deleted is True
         assert await cache.get("delete_key") is None
 
+class TestTTLCache:
+    """Test the in-process TTL cache"""
+
+    def test_set_and_get(self):
+        """Test values can be stored and read back"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+        assert "a" in cache
+
+    def test_expired_entries_are_dropped(self):
+        """Test entries past their TTL are treated as missing"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1, ttl=-1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the oldest untouched entry is evicted when full"""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
 @pytest.mark.asyncio
 class TestRedisCache:
     """Test Redis cache implementation"""